@@ -1,6 +1,29 @@
 import pygame
 import os
 
+from tools.frame_cache import FrameCache
+from tools.sprite_atlas import SpriteFrame
+
+# Finished (composited and scaled) characters, keyed by (canvas size, resolved
+# layers, image_size, scale), so a page shown for many frames is composed once;
+# least recently drawn go first
+COMPOSITE_CACHE_BYTES = 96 * 2**20
+_composite_cache = FrameCache(COMPOSITE_CACHE_BYTES)
+
+# Characters with this many layers or more (modular face_parts ones: pose, base
+# and four expression parts) also keep every intermediate composite, so changing
+# one part recomposes only from that layer up. Keyed by (canvas size, bounds
+# topleft, bounds size, the layers composited so far)
+LAYERED_MIN_LAYERS = 4
+PREFIX_CACHE_BYTES = 64 * 2**20
+_prefix_cache = FrameCache(PREFIX_CACHE_BYTES)
+
+# path -> SpriteFrame of the layer cropped to its opaque pixels (None if it failed
+# to load). Filled on first use, or ahead of time by rendering.prefetch via store_layer;
+# least recently used layers go first, and are simply reloaded if needed again
+LAYER_CACHE_BYTES = 128 * 2**20
+_layer_cache = FrameCache(LAYER_CACHE_BYTES)
+
 def load_image_safe(path):
     try:
         return pygame.image.load(path).convert_alpha()
@@ -8,78 +31,195 @@ def load_image_safe(path):
         print(f"[!] Failed to load {path}: {e}")
         return None
 
-def render_character(page, base_path="assets/characters"):
+def crop_layer(image):
+    """Most pose/face PNGs are full-canvas and mostly transparent: keep only the
+    opaque bounding box, with its offset into the original canvas."""
+    rect = image.get_bounding_rect()
+    if rect.width == 0 or rect.height == 0:
+        return SpriteFrame(pygame.Surface((0, 0), pygame.SRCALPHA), (0, 0), image.get_size())  # Fully transparent
+    return SpriteFrame(image.subsurface(rect).copy(), rect.topleft, image.get_size())
+
+def _load_cropped(path):
+    image = load_image_safe(path)
+    return crop_layer(image) if image is not None else None
+
+def load_layer(path):
+    return _layer_cache.get(path, None, lambda _: _load_cropped(path))
+
+def is_layer_cached(path):
+    return path in _layer_cache
+
+def store_layer(path, image):
+    """Add a layer decoded elsewhere (e.g. on a worker thread); converts it, so call from the main thread."""
+    _layer_cache.put(path, crop_layer(image.convert_alpha()) if image is not None else None)
+
+def resolve_layers(page, base_path="assets/characters"):
+    """
+    The layers a page's character is drawn from, bottom to top.
+
+    Returns (canvas_size, layers) or None, where layers is a list of
+    (image path, (x, y), required) and canvas_size is None to use the size
+    of the first layer. A page whose required layer fails to load draws nothing.
+    """
     character = page.get("character")
     if not character and "image" not in page:
         return None
 
     char_path = os.path.join(base_path, character) if character else None
-    return_surf = None
 
     # === Cassian Modular (face_parts) ===
     if page.get("face_parts") and "pose" in page:
-        pose = load_image_safe(os.path.join(char_path, "Poses", f"{page['pose']}.png"))
-        base = load_image_safe(os.path.join(char_path, "Expressions", "base.png"))
-        if not pose or not base:
-            return None
+        layers = [
+            (os.path.join(char_path, "Poses", f"{page['pose']}.png"), (0, 0), True),
+            (os.path.join(char_path, "Expressions", "base.png"), (0, 0), True),
+        ]
         for part, folder in zip(page['face_parts'], ["eyes", "eyebrows", "mouth", "nose"]):
-            part_path = os.path.join(char_path, "Expressions", folder, f"{part}.png")
-            overlay = load_image_safe(part_path)
-            if overlay:
-                base.blit(overlay, (0, 0))
-        final = pygame.Surface(pose.get_size(), pygame.SRCALPHA)
-        final.blit(pose, (0, 0))
-        final.blit(base, (0, 0))
-        return_surf = final
+            layers.append((os.path.join(char_path, "Expressions", folder, f"{part}.png"), (0, 0), False))
+        return None, layers
 
     # === Dual Pose + Face (e.g. bodyL, bodyR + face) ===
     elif all(k in page for k in ("pose_left", "pose_right", "face")):
-        left = load_image_safe(os.path.join(char_path, f"{page['pose_left']}.png"))
-        right = load_image_safe(os.path.join(char_path, f"{page['pose_right']}.png"))
-        face = load_image_safe(os.path.join(char_path, f"{page['face']}.png"))
-        if not all([left, right, face]):
-            return None
-        pose = pygame.Surface(left.get_size(), pygame.SRCALPHA)
-        pose.blit(left, (0, 0))
-        pose.blit(right, (0, 0))
-        pose.blit(face, (0, 0))
-        return_surf = pose
+        return None, [
+            (os.path.join(char_path, f"{page[k]}.png"), (0, 0), True)
+            for k in ("pose_left", "pose_right", "face")
+        ]
 
     # === Single Pose + Face ===
     elif all(k in page for k in ("pose", "face")):
-        pose = load_image_safe(os.path.join(char_path, f"{page['pose']}.png"))
-        face = load_image_safe(os.path.join(char_path, f"{page['face']}.png"))
-        if not pose or not face:
-            return None
-        final = pygame.Surface(pose.get_size(), pygame.SRCALPHA)
-        final.blit(pose, (0, 0))
-        final.blit(face, (0, 0))
-        return_surf = final
+        return None, [
+            (os.path.join(char_path, f"{page[k]}.png"), (0, 0), True)
+            for k in ("pose", "face")
+        ]
 
     # === Single Image ===
     elif "image" in page:
-        img = load_image_safe(page["image"])
-        return_surf = img
+        return None, [(page["image"], (0, 0), True)]
 
     # === Custom Mode? ===
     elif "custom_parts" in page:
-        surf = pygame.Surface((800, 800), pygame.SRCALPHA)
-        for part in page["custom_parts"]:
-            part_img = load_image_safe(os.path.join(char_path, part["index"]))
-            if part_img:
-                surf.blit(part_img, (part["x"], part["y"]))
-        return_surf = surf
+        return (800, 800), [
+            (os.path.join(char_path, part["index"]), (part["x"], part["y"]), False)
+            for part in page["custom_parts"]
+        ]
 
     # === None found ===
-    if return_surf is None:
+    return None
+
+def layer_paths(page, base_path="assets/characters"):
+    """Every image file render_character would read for page."""
+    resolved = resolve_layers(page, base_path)
+    return [path for path, _, _ in resolved[1]] if resolved else []
+
+def render_character_frame(page, base_path="assets/characters"):
+    """
+    The page's character as a SpriteFrame: surface holds only the opaque union
+    of its layers, to be drawn at page["position"] + offset. size is the full,
+    untrimmed canvas size. Offsets and size are already scaled.
+    """
+    resolved = resolve_layers(page, base_path)
+    if resolved is None:
         return None
+    canvas_size, layers = resolved
+    image_size = tuple(page["image_size"]) if "image_size" in page else None
+    key = (canvas_size, tuple(layers), image_size, page.get("scale"))
+    return _composite_cache.get(key, None, lambda _: _compose(canvas_size, layers, image_size, page.get("scale")))
+
+def render_character(page, base_path="assets/characters"):
+    """The character on its full, untrimmed canvas (uncached; drawing code should
+    use render_character_frame instead)."""
+    frame = render_character_frame(page, base_path)
+    if frame is None:
+        return None
+    surf = pygame.Surface(frame.size, pygame.SRCALPHA)
+    surf.blit(frame.surface, frame.offset)
+    return surf
+
+def _load_layers(canvas_size, layers):
+    """[(layer, (x, y))] for the layers that loaded, plus the full canvas size; None
+    if a required layer is missing."""
+    loaded = []
+    for path, pos, required in layers:
+        layer = load_layer(path)
+        if layer is None:
+            if required:
+                return None
+            continue
+        loaded.append((layer, pos))
+    if canvas_size is None:
+        canvas_size = loaded[0][0].size
+    return loaded, canvas_size
+
+def _bounds(loaded, canvas_size):
+    """Union of the layers' opaque boxes, clipped to the canvas."""
+    canvas = pygame.Rect((0, 0), canvas_size)
+    rects = [
+        pygame.Rect(pos[0] + layer.offset[0], pos[1] + layer.offset[1], *layer.surface.get_size())
+        for layer, pos in loaded
+        if layer.surface.get_width() and layer.surface.get_height()
+    ]
+    bounds = rects[0].unionall(rects[1:]).clip(canvas) if rects else pygame.Rect(0, 0, 0, 0)
+    if bounds.width == 0 or bounds.height == 0:
+        bounds = pygame.Rect(0, 0, 1, 1)
+    return bounds
+
+def _compose(canvas_size, layers, image_size, scale):
+    resolved = _load_layers(canvas_size, layers)
+    if resolved is None:
+        return None
+    loaded, canvas_size = resolved
+    bounds = _bounds(loaded, canvas_size)
+
+    if len(layers) >= LAYERED_MIN_LAYERS:
+        surf = _compose_layered(canvas_size, layers, bounds)
+    elif len(loaded) == 1 and loaded[0][0].surface.get_size() == bounds.size:
+        surf = loaded[0][0].surface  # Single layer, drawn as loaded
+    else:
+        surf = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        surf.blits([
+            (layer.surface, (pos[0] + layer.offset[0] - bounds.x, pos[1] + layer.offset[1] - bounds.y))
+            for layer, pos in loaded
+        ], doreturn=False)
 
     # === SCALING SUPPORT ===
-    if "image_size" in page:
-        return_surf = pygame.transform.smoothscale(return_surf, tuple(page["image_size"]))
-    elif "scale" in page:
-        w, h = return_surf.get_size()
-        s = page["scale"]
-        return_surf = pygame.transform.smoothscale(return_surf, (int(w * s), int(h * s)))
-
-    return return_surf
+    if image_size is not None:
+        full_size = image_size
+    elif scale is not None:
+        full_size = (int(canvas_size[0] * scale), int(canvas_size[1] * scale))
+    else:
+        return SpriteFrame(surf, bounds.topleft, canvas_size)
+    # smoothscale's filter depends on where the image starts, so scale the whole
+    # canvas as before (once per composite) and crop the result instead
+    canvas = pygame.Surface(canvas_size, pygame.SRCALPHA)
+    canvas.blit(surf, bounds.topleft, special_flags=pygame.BLEND_RGBA_MAX)  # Exact copy onto transparent
+    return crop_layer(pygame.transform.smoothscale(canvas, full_size))
+
+def _compose_layered(canvas_size, layers, bounds):
+    layers = tuple(layers)
+
+    # Start from the longest prefix composited before (e.g. everything below a changed mouth)
+    start = len(layers) - 1
+    surf = None
+    while start > 0:
+        prefix = _prefix_cache.peek((canvas_size, bounds.topleft, bounds.size, layers[:start]))
+        if prefix is not None:
+            surf = prefix.copy()
+            break
+        start -= 1
+    if surf is None:
+        start = 0
+        surf = pygame.Surface(bounds.size, pygame.SRCALPHA)
+
+    for i in range(start, len(layers)):
+        path, pos, _ = layers[i]
+        layer = load_layer(path)
+        if layer is not None:
+            surf.blit(layer.surface, (pos[0] + layer.offset[0] - bounds.x, pos[1] + layer.offset[1] - bounds.y))
+        if i < len(layers) - 1:
+            _prefix_cache.put((canvas_size, bounds.topleft, bounds.size, layers[:i + 1]), surf.copy())
+    return surf
+
+def clear_caches():
+    """Forget every loaded layer and composite (e.g. after character art changed on disk)."""
+    _layer_cache.clear()
+    _composite_cache.clear()
+    _prefix_cache.clear()
@@ -2,27 +2,65 @@ import os
 import pygame
 
 from discord import presence
+from tools.bot_schedule import BotSchedule
 from tools.character_animations import CharacterAnimator
+from tools.draw_list import DrawList
 from tools.event_handler import EventHandler
 from tools.judgement_splash import JudgementSplash
 from tools.lane_manager import LaneManager
 from tools import judgement
 from tools.utils import VideoPlayer
+from tools import video_cache
 from tools.xml_sprite_loader import load_sprites_from_xml, load_character_frames, load_character_sprites_from_xml
 from tools.loader import load_fnf_chart, load_chart
+from tools.song_audio import SongAudio
+from tools.song_clock import SongClock
+from tools.note import ScrollMap
+
+
+def chart_path(song_name):
+    return f"assets/minigame/songs/{song_name}/{song_name}.json"
+
+
+def open_song_audio(song_name):
+    """SongAudio for a song (the vocal stem starts decoding in the background), or None."""
+    inst_path = f"assets/minigame/songs/{song_name}/Inst.ogg"
+    voices_path = f"assets/minigame/songs/{song_name}/Voices.ogg"
+    fallback_mp3 = f"assets/minigame/songs/{song_name}/{song_name}.mp3"
+
+    if os.path.exists(inst_path) and os.path.exists(voices_path):
+        return SongAudio(inst_path, voices_path)
+    if os.path.exists(fallback_mp3):
+        return SongAudio(fallback_mp3)
+    return None
 
 
 class Conductor:
-    def __init__(self, song_name, frames, screen, side_configs):
+    def __init__(self, song_name, frames, screen, side_configs, chart=None, song_audio=None):
+        """
+        chart: load_chart(chart_path(song_name), "fnf") result, if already loaded
+            (e.g. by a tools.asset_loader worker); loaded here otherwise
+        song_audio: SongAudio opened ahead of time with open_song_audio()
+        """
         self.song_name = song_name
         self.frames = frames
         self.screen = screen
         self.lanes = []
-        self.start_time = None
+        self.song_clock = SongClock()
+        self.song_audio = song_audio
+        self.draw_list = DrawList(screen)
+
+        # --- Start decoding audio while the chart and lanes are set up ---
+        if self.song_audio is None:
+            self.load_music(song_name)
 
         # --- Use legacy_loader for all chart parsing and BPM/song_speed extraction ---
-        chart_path = f"assets/minigame/songs/{song_name}/{song_name}.json"
-        bpm, song_speed, player_notes, opponent_notes, song_meta, section_list, events = load_chart(chart_path, "fnf")
+        if chart is None:
+            chart = load_chart(chart_path(song_name), "fnf")
+        bpm, song_speed, player_notes, opponent_notes, song_meta, section_list, events = chart
+
+        # --- Scroll position vs. time, shared by every lane ---
+        scroll_map = ScrollMap(section_list, events, bpm=bpm, song_speed=song_speed)
 
         # --- Event support ---
         self.event_handler = EventHandler(events, conductor=self)
@@ -40,6 +78,12 @@ class Conductor:
             else:
                 charts.append(opponent_notes)
 
+        # --- One bot timeline per chart, shared by every bot lane playing it ---
+        bot_schedules = {}
+        for i, side_cfg in enumerate(side_configs):
+            if not side_cfg.get('is_player', False) and id(charts[i]) not in bot_schedules:
+                bot_schedules[id(charts[i])] = BotSchedule(charts[i])
+
         # --- Initialize LaneManagers with bpm and song_speed ---
         for i, side_cfg in enumerate(side_configs):
             lane = LaneManager(
@@ -57,34 +101,31 @@ class Conductor:
                 key_map=side_cfg.get('key_map'),
                 lane_positions=side_cfg.get('lane_positions'),
                 section_list=section_list,
+                scroll_map=scroll_map,
+                bot_schedule=bot_schedules.get(id(charts[i])),
                 judgement_splash=self.judgement_splash if side_cfg['name'] == "player" else None  # THIS LINE ADDED
             )
             self.lanes.append(lane)
 
         self.load_and_play_music(song_name)
 
-    def load_and_play_music(self, song_name):
-        inst_path = f"assets/minigame/songs/{song_name}/Inst.ogg"
-        voices_path = f"assets/minigame/songs/{song_name}/Voices.ogg"
-        fallback_mp3 = f"assets/minigame/songs/{song_name}/{song_name}.mp3"
-
-        if os.path.exists(inst_path) and os.path.exists(voices_path):
-            inst_sound = pygame.mixer.Sound(inst_path)
-            voices_sound = pygame.mixer.Sound(voices_path)
+    def load_music(self, song_name):
+        """Open the song's audio; the vocal stem starts decoding in the background."""
+        self.song_audio = open_song_audio(song_name)
 
-            self.inst_channel = pygame.mixer.Channel(0)
-            self.voices_channel = pygame.mixer.Channel(1)
+    def load_and_play_music(self, song_name):
+        if self.song_audio is None:
+            self.load_music(song_name)
+        if self.song_audio is None:
+            return
+        self.song_audio.play()
+        self.song_clock.start(position_source=self.song_audio.get_pos)
 
-            self.inst_channel.play(inst_sound)
-            self.voices_channel.play(voices_sound)
-            self.start_time = pygame.time.get_ticks()  # <-- Move here!
-        elif os.path.exists(fallback_mp3):
-            pygame.mixer.music.load(fallback_mp3)
-            pygame.mixer.music.play()
-            self.start_time = pygame.time.get_ticks()  # <-- Move here!
+    def preload_video(self, path):
+        video_cache.preload(path, self.screen.get_size())
 
     def play_video(self, path):
-        self.video_player = VideoPlayer(path, self.screen.get_size())
+        self.video_player = VideoPlayer(path, self.screen.get_size(), start_time=self.get_song_time())
         self.video_active = True
 
     def set_scroll_speed(self, speed, lane=None):
@@ -96,13 +137,14 @@ class Conductor:
                 lane_obj.scroll_speed = speed
         print(f"Set scroll speed: {speed} (lane {lane})")
     def get_song_time(self):
-        return pygame.time.get_ticks() - self.start_time
+        return self.song_clock.get_time()
 
     def update(self, dt):
+        self.song_clock.sync()
         song_time = self.get_song_time()
         self.event_handler.update(song_time)
         if self.video_active:
-            frame = self.video_player.update(dt)
+            frame = self.video_player.update(song_time)
             if frame is None:
                 self.video_active = False
                 self.video_player.release()
@@ -117,9 +159,10 @@ class Conductor:
     def draw(self):
         song_time = self.get_song_time()
         for lane in self.lanes:
-            lane.draw(song_time)
+            lane.draw(song_time, self.draw_list)
+        self.draw_list.flush()
         # Overlay video if active (draws ON TOP)
-        if self.video_active and self.video_player and self.video_player.frame:
+        if self.video_active and self.video_player and self.video_player.frame_index >= 0:
             self.video_player.draw(self.screen)
 
 # ------------------- MAIN GAME LOOP DEMO ------------------------
@@ -147,8 +190,8 @@ if __name__ == "__main__":
     # player_animator = CharacterAnimator(dustman_frames, position=(950, 620))
     # tiffany_animator = CharacterAnimator(tiffany_frames, position=(330, 620))
 
-    player_animator = CharacterAnimator(dustman_frames, position=(1000, 575))
-    tiffany_animator = CharacterAnimator(tiffany_frames, position=(550, 400))
+    player_animator = CharacterAnimator(dustman_frames, position=(1000, 575), sheet_id=("assets/minigame/characters/dearest_fnfbaby.xml", 0.3))
+    tiffany_animator = CharacterAnimator(tiffany_frames, position=(550, 400), sheet_id=("assets/minigame/characters/nmi_real.xml", 0.2))
 
     # Load 5 background layers
     layer_filenames = [
@@ -7,12 +7,17 @@ import os
 from pygame.locals import *
 from time import sleep
 
-from character_renderer import render_character
-from conductor import Conductor
+from character_renderer import render_character_frame
+from conductor import Conductor, chart_path, open_song_audio
 from discord import presence
 from rendering.background import BackgroundManager
+from rendering.fonts import get_font, render_text
+from rendering.prefetch import Prefetcher
 from rendering.text import TextManager
-from tools.xml_sprite_loader import load_sprites_from_xml, load_character_frames, load_character_sprites_from_xml
+from tools.asset_loader import AssetLoader
+from tools.loader import load_chart
+from tools import video_cache
+from tools.xml_sprite_loader import read_sheet, finish_sprites, finish_character_sprites, load_character_frames
 from tools.character_animations import CharacterAnimator
 
 # === Configuration ===
@@ -34,27 +39,90 @@ selected_option = 0
 last_page = -1
 user_text_speed = 40  # ms per character (default speed if page doesn't override)
 
+# === Static UI surfaces: loaded, converted and scaled (or pre-rendered) once ===
+_ui_cache = {}
+
+def ui_image(path, size, alpha=False, smooth=False):
+    key = (path, size, alpha, smooth)
+    if key not in _ui_cache:
+        image = pygame.image.load(path)
+        image = image.convert_alpha() if alpha else image.convert()
+        scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        _ui_cache[key] = scale(image, size)
+    return _ui_cache[key]
+
+def option_box_surface(text, width, height, selected):
+    key = ("option_box", text, width, height, selected)
+    if key not in _ui_cache:
+        box_color = (255, 182, 193)
+        border_color = (255, 105, 180) if selected else (200, 100, 120)
+        text_color = (0, 0, 0)
+        surf = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(surf, box_color, (0, 0, width, height), border_radius=12)
+        pygame.draw.rect(surf, border_color, (0, 0, width, height), 3 if selected else 1, border_radius=12)
+        text_surface = render_text(get_font(None, 32), text, text_color)
+        surf.blit(text_surface, text_surface.get_rect(center=(width // 2, height // 2)))
+        _ui_cache[key] = surf
+    return _ui_cache[key]
+
 def load_story(json_file):
     with open(json_file, "r", encoding="utf-8") as f:
         return json.load(f)
 
 def draw_text(screen, text, position, color=(0, 0, 0), font_size=24):
-    font = pygame.font.Font("assets/fonts/VarelaRound-Regular.ttf", font_size)
-    text_surface = font.render(text, True, color)
-    screen.blit(text_surface, position)
+    font = get_font("assets/fonts/VarelaRound-Regular.ttf", font_size)
+    screen.blit(render_text(font, text, color), position)
+
+def draw_loading_screen(screen, progress):
+    screen.fill((0, 0, 0))
+    draw_text(screen, "Loading...", (SCREEN_WIDTH // 2 - 60, SCREEN_HEIGHT // 2 - 60), color=(255, 255, 255), font_size=32)
+    bar = pygame.Rect(SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2, 400, 20)
+    pygame.draw.rect(screen, (255, 105, 180), (bar.x, bar.y, int(bar.width * progress), bar.height))
+    pygame.draw.rect(screen, (255, 255, 255), bar, 2)
+
+# Sprite sheets of the rhythm minigame: name -> (png, xml, scale, character sheet)
+MINIGAME_SHEETS = {
+    "notes": ("assets/minigame/notes/NOTE_assets.png", "assets/minigame/notes/NOTE_assets.xml", 0.7, False),
+    "dustman": ("assets/minigame/characters/dustmanltbl.png", "assets/minigame/characters/dustmanltbl.xml", 0.6, True),
+    "megaman": ("assets/minigame/characters/megamanltbl1.png", "assets/minigame/characters/megamanltbl1.xml", 0.6, True),
+}
 
 def run_rhythm_minigame(screen, song_name="tutorial"):
-    frames = load_sprites_from_xml(
-        "assets/minigame/notes/NOTE_assets.png",
-        "assets/minigame/notes/NOTE_assets.xml",
-        scale=0.7
-    )
-    dustman_raw = load_character_sprites_from_xml("assets/minigame/characters/dustmanltbl.png", "assets/minigame/characters/dustmanltbl.xml", scale=0.6)
+    # Decode, parse and hash everything on worker threads; song audio starts decoding too
+    loader = AssetLoader()
+    for name, sheet in MINIGAME_SHEETS.items():
+        loader.submit(name, read_sheet, *sheet)
+    loader.image("background", "assets/minigame/backgrounds/lettherebebg.png")
+    chart_job = loader.submit("chart", load_chart, chart_path(song_name), "fnf")
+    song_audio = open_song_audio(song_name)
+
+    # Keep the window responsive until the workers are done
+    clock = pygame.time.Clock()
+    videos_queued = False
+    while not (videos_queued and loader.done()) or (song_audio is not None and not song_audio.ready()):
+        if not videos_queued and chart_job.done():
+            # First run: transcode the chart's clips here, before play(), never during the song
+            videos_queued = True
+            if chart_job.exception() is None:
+                events = chart_job.result()[6]
+                loader.submit("videos", video_cache.transcode_missing, video_cache.chart_video_paths(events), screen.get_size())
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                loader.shutdown()
+                return
+        draw_loading_screen(screen, loader.progress())
+        pygame.display.flip()
+        clock.tick(60)
+    loader.shutdown()
+
+    # Display-dependent steps (convert, subsurfaces, scaling) stay on the main thread
+    frames = finish_sprites(loader.result("notes"))
+    dustman_raw = finish_character_sprites(loader.result("dustman"))
     dustman_frames = load_character_frames("unused", dustman_raw)
-    megaman_raw = load_character_sprites_from_xml("assets/minigame/characters/megamanltbl1.png", "assets/minigame/characters/megamanltbl1.xml", scale=0.6)
+    megaman_raw = finish_character_sprites(loader.result("megaman"))
     tiffany_frames = load_character_frames("tiffany", megaman_raw)
-    player_animator = CharacterAnimator(dustman_frames, position=(950, 620))
-    tiffany_animator = CharacterAnimator(tiffany_frames, position=(330, 620))
+    player_animator = CharacterAnimator(dustman_frames, position=(950, 620), sheet_id=("assets/minigame/characters/dustmanltbl.xml", 0.6))
+    tiffany_animator = CharacterAnimator(tiffany_frames, position=(330, 620), sheet_id=("assets/minigame/characters/megamanltbl1.xml", 0.6))
     player_key_map = {
         pygame.K_a: 'left',
         pygame.K_s: 'down',
@@ -69,9 +137,8 @@ def run_rhythm_minigame(screen, song_name="tutorial"):
         {'name': "tiffany", 'animator': player_animator, 'arrow_x': 900},
         {'name': "player", 'animator': tiffany_animator, 'arrow_x': 350, 'is_player': True, 'key_map': player_key_map}
     ]
-    conductor = Conductor(song_name, frames, screen, side_configs)
-    clock = pygame.time.Clock()
-    background_img = pygame.image.load("assets/minigame/backgrounds/lettherebebg.png").convert()
+    conductor = Conductor(song_name, frames, screen, side_configs, chart=loader.result("chart"), song_audio=song_audio)
+    background_img = loader.result("background").convert()
     background_img = pygame.transform.smoothscale(background_img, (1280, 720))
     running = True
     while running:
@@ -95,8 +162,7 @@ def load_song(song_name="song", song_type="mp3", loops=0):
     pygame.mixer.music.play(loops)
 
 def draw_textbox(screen):
-    sprite = pygame.image.load("assets/icons/text_box.png").convert_alpha()
-    sprite = pygame.transform.smoothscale(sprite, (TEXTBOX_WIDTH, TEXTBOX_HEIGHT))
+    sprite = ui_image("assets/icons/text_box.png", (TEXTBOX_WIDTH, TEXTBOX_HEIGHT), alpha=True, smooth=True)
     screen.blit(sprite, (TEXTBOX_X, TEXTBOX_Y))
 
 def draw_character(screen, image_path, position, size=None):
@@ -123,34 +189,33 @@ def handle_input_event(event, selected_input):
         input_texts[selected_input] += event.unicode
     return False
 
+OPTION_BOX_WIDTH, OPTION_BOX_HEIGHT = 300, 50
+
 def draw_start_screen(screen, selected_option, options):
-    bg = pygame.image.load("assets/screens/all_singers.png").convert()
-    bg = pygame.transform.scale(bg, (SCREEN_WIDTH, SCREEN_HEIGHT))
-    screen.blit(bg, (0, 0))
+    screen.blit(ui_image("assets/screens/all_singers.png", (SCREEN_WIDTH, SCREEN_HEIGHT)), (0, 0))
     for i, option in enumerate(options):
         x = SCREEN_WIDTH // 2 - 600
         y = 450 + i * 70
-        draw_option_box(screen, option, x, y, 300, 50, selected_option == i)
+        draw_option_box(screen, option, x, y, OPTION_BOX_WIDTH, OPTION_BOX_HEIGHT, selected_option == i)
+
+def preload_ui():
+    """Load the static UI and render both states of every start menu option up front."""
+    ui_image("assets/icons/text_box.png", (TEXTBOX_WIDTH, TEXTBOX_HEIGHT), alpha=True, smooth=True)
+    ui_image("assets/screens/all_singers.png", (SCREEN_WIDTH, SCREEN_HEIGHT))
+    ui_image("assets/screens/gmenu.png", (SCREEN_WIDTH, SCREEN_HEIGHT))
+    for option in start_options:
+        for selected in (False, True):
+            option_box_surface(option, OPTION_BOX_WIDTH, OPTION_BOX_HEIGHT, selected)
 
 def draw_glitched_menu(screen):
-    bg = pygame.image.load("assets/screens/gmenu.png").convert()
-    bg = pygame.transform.scale(bg, (SCREEN_WIDTH, SCREEN_HEIGHT))
-    screen.blit(bg, (0, 0))
+    screen.blit(ui_image("assets/screens/gmenu.png", (SCREEN_WIDTH, SCREEN_HEIGHT)), (0, 0))
     draw_text(screen, "Monika Club", (SCREEN_WIDTH // 2 - 150, 100), font_size=48, color=(255, 0, 0))
     draw_text(screen, "St_rt", (SCREEN_WIDTH // 2 - 100, 250), font_size=32, color=(200, 0, 0))
     draw_text(screen, "Load.chr [missing]", (SCREEN_WIDTH // 2 - 100, 300), font_size=32, color=(180, 0, 0))
     draw_text(screen, "Exi__", (SCREEN_WIDTH // 2 - 100, 350), font_size=32, color=(255, 255, 255))
 
 def draw_option_box(screen, text, x, y, width, height, selected):
-    box_color = (255, 182, 193)
-    border_color = (255, 105, 180) if selected else (200, 100, 120)
-    text_color = (0, 0, 0)
-    pygame.draw.rect(screen, box_color, (x, y, width, height), border_radius=12)
-    pygame.draw.rect(screen, border_color, (x, y, width, height), 3 if selected else 1, border_radius=12)
-    font = pygame.font.Font(None, 32)
-    text_surface = font.render(text, True, text_color)
-    text_rect = text_surface.get_rect(center=(x + width // 2, y + height // 2))
-    screen.blit(text_surface, text_rect)
+    screen.blit(option_box_surface(text, width, height, selected), (x, y))
 
 def draw_input_box(screen, position, width, height, text='', selected=False):
     border_color = (255, 0, 0) if selected else (0, 0, 0)
@@ -166,6 +231,7 @@ def run_gui():
     pygame.display.set_caption('Cadence Collapse')
     icon_surface = pygame.image.load("assets/icons/icon32.png").convert_alpha()
     pygame.display.set_icon(icon_surface)
+    preload_ui()
     clock = pygame.time.Clock()
     presence.set_presence(details="In Main Menu")
 
@@ -178,6 +244,7 @@ def run_gui():
 
 
     story = load_story('story.json')
+    prefetcher = Prefetcher(story, background_manager, game_sheets=MINIGAME_SHEETS)
     running = True
     load_song("my_little_world", "wav", 1)
 
@@ -200,9 +267,7 @@ def run_gui():
                             in_start_screen = False
                         elif selected_option == 1:
                             print("Load option is disabled.")
-                            bgtemp = pygame.image.load("assets/screens/gmenu.png").convert()
-                            bgtemp = pygame.transform.scale(bgtemp, (SCREEN_WIDTH, SCREEN_HEIGHT))
-                            screen.blit(bgtemp, (0, 0))
+                            screen.blit(ui_image("assets/screens/gmenu.png", (SCREEN_WIDTH, SCREEN_HEIGHT)), (0, 0))
                             pygame.display.flip()
                             sleep(0.5)
                             draw_start_screen(screen, selected_option, start_options)
@@ -244,6 +309,10 @@ def run_gui():
                         else:
                             current_page += 1
 
+        # Warm the caches for the pages coming up
+        prefetcher.update(current_page)
+        prefetcher.pump()
+
         # === Render current screen ===
         if in_start_screen:
             draw_start_screen(screen, selected_option, start_options)
@@ -272,9 +341,10 @@ def run_gui():
 
             try:
                 if "position" in page:
-                    sprite = render_character(page)
+                    sprite = render_character_frame(page)
                     if sprite:
-                        screen.blit(sprite, page["position"])
+                        x, y = page["position"]
+                        screen.blit(sprite.surface, (x + sprite.offset[0], y + sprite.offset[1]))
             except Exception as e:
                 print(f"[!] Character render error on page {current_page}: {e}")
 
@@ -305,6 +375,7 @@ def run_gui():
         pygame.display.flip()
         clock.tick(30)
 
+    prefetcher.shutdown()
     pygame.quit()
     sys.exit()
 
@@ -3,7 +3,7 @@ import pygame
 import json
 import os
 from pygame.locals import *
-from character_renderer import render_character  # assumes this exists
+from character_renderer import render_character_frame  # assumes this exists
 
 # === Config ===
 SCREEN_WIDTH, SCREEN_HEIGHT = 1500, 1000
@@ -134,9 +134,9 @@ def main():
             print("[!] Index error building temp_page.")
             temp_page = {}
 
-        preview = render_character(temp_page)
+        preview = render_character_frame(temp_page)
         if preview:
-            screen.blit(preview, (50, 50))
+            screen.blit(preview.surface, (50 + preview.offset[0], 50 + preview.offset[1]))
         else:
             print("[!] Failed to render character preview.")
 
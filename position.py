@@ -2,7 +2,7 @@ import pygame
 import json
 import os
 from pygame.locals import *
-from character_renderer import render_character
+from character_renderer import render_character_frame
 
 # === Config ===
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
@@ -34,9 +34,9 @@ def main():
             page["position"] = [SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2]
         pos = page["position"]
 
-        sprite = render_character(page)  # << use new renderer
+        sprite = render_character_frame(page)  # << use new renderer
         if sprite:
-            screen.blit(sprite, pos)
+            screen.blit(sprite.surface, (pos[0] + sprite.offset[0], pos[1] + sprite.offset[1]))
 
         # UI
         text = page.get("text", "")
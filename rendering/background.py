@@ -1,25 +1,92 @@
 # === Load background ===
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import pygame
 
+DEFAULT_BUDGET_BYTES = 48 * 2**20  # about 12 converted 1280x720 backgrounds
+
 
 class BackgroundManager:
-    def __init__(self, width, height):
-        self.cache = {}
+    def __init__(self, width, height, budget_bytes=DEFAULT_BUDGET_BYTES):
+        """
+        Backgrounds are kept scaled to the screen in an LRU cache of at most
+        budget_bytes (the current and fading-out backgrounds are never evicted).
+        preload(name) decodes and scales on a worker thread; pump() converts
+        finished preloads on the main thread.
+        """
+        self.cache = OrderedDict()
+        self.cache_bytes = 0
+        self.budget_bytes = budget_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="background")
+        self._pending = {}  # name -> future of a decoded, scaled, not yet converted image
         self.current = None
         self.previous = None
         self.alpha = 0
-        self.fade_speed = 10
+        self.fade_duration = 850  # ms; about the old 10 alpha per frame at 30 fps
+        self.fade_start = 0
         self.SCREEN_WIDTH = width
         self.SCREEN_HEIGHT = height
 
+    @staticmethod
+    def bg_path(name):
+        return os.path.join("assets/backgrounds", name)
+
+    def _decode(self, name):
+        # No display access here: runs on the preload worker
+        image = pygame.image.load(self.bg_path(name))
+        return pygame.transform.scale(image, (self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+
     def get_bg(self, name):
-        if name not in self.cache:
-            path = os.path.join("assets/backgrounds", name)
-            bg = pygame.image.load(path).convert()
-            self.cache[name] = pygame.transform.scale(bg, (self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
-        return self.cache[name]
+        bg = self.cache.get(name)
+        if bg is not None:
+            self.hits += 1
+            self.cache.move_to_end(name)
+            return bg
+
+        self.misses += 1
+        future = self._pending.pop(name, None)
+        image = future.result() if future is not None else self._decode(name)
+        return self._insert(name, image.convert())
+
+    def preload(self, name):
+        """Start decoding a background in the background, unless it is cached or on its way."""
+        if name not in self.cache and name not in self._pending:
+            self._pending[name] = self._executor.submit(self._decode, name)
+
+    def pump(self):
+        """Convert finished preloads into the cache (main thread; never waits)."""
+        for name, future in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[name]
+            try:
+                image = future.result()
+            except Exception as e:
+                print(f"[background] Could not preload {name}: {e}")
+                continue
+            if name not in self.cache:
+                self._insert(name, image.convert())
+
+    def _insert(self, name, bg):
+        self.cache[name] = bg
+        self.cache_bytes += bg.get_width() * bg.get_height() * bg.get_bytesize()
+        for old in list(self.cache):
+            if self.cache_bytes <= self.budget_bytes:
+                break
+            if old in (name, self.current, self.previous):
+                continue
+            evicted = self.cache.pop(old)
+            self.cache_bytes -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
+            self.evictions += 1
+        return bg
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
     def set_background(self, name, fade=True):
         # No change -> do nothing
@@ -30,6 +97,7 @@ class BackgroundManager:
         if fade and name.lower() != "sudden":
             self.previous = self.current
             self.alpha = 255
+            self.fade_start = pygame.time.get_ticks()
         else:
             self.previous = None
             self.alpha = 0
@@ -43,13 +111,13 @@ class BackgroundManager:
 
         curr_img = self.get_bg(self.current)
         if self.previous and self.alpha > 0:
-            prev_img = self.get_bg(self.previous).copy()
-            temp = curr_img.copy()
-            prev_img.set_alpha(self.alpha)
-            temp.set_alpha(255 - self.alpha)
-            screen.blit(prev_img, (0, 0))
-            screen.blit(temp, (0, 0))
-            self.alpha = max(0, self.alpha - self.fade_speed)
+            # Cross-fade with per-surface alpha on the cached surfaces: no copies per frame
+            elapsed = pygame.time.get_ticks() - self.fade_start
+            self.alpha = max(0, 255 - 255 * elapsed // max(1, self.fade_duration))
+            screen.blit(self.get_bg(self.previous), (0, 0))
+            curr_img.set_alpha(255 - self.alpha)
+            screen.blit(curr_img, (0, 0))
+            curr_img.set_alpha(None)
         else:
             screen.blit(curr_img, (0, 0))
-            self.previous = None
\ No newline at end of file
+            self.previous = None
@@ -0,0 +1,32 @@
+import pygame
+
+from tools.frame_cache import FrameCache
+
+# (path, size, bold, italic, underline) -> Font; path None is pygame's default font
+_fonts = {}
+
+# Rendered text by (font, text, color, antialias), least recently drawn evicted first
+TEXT_CACHE_BYTES = 8 * 2**20
+_text_cache = FrameCache(TEXT_CACHE_BYTES)
+
+
+def get_font(path=None, size=24, bold=False, italic=False, underline=False):
+    """Shared Font for (path, size, style); each TTF is opened once per size and style."""
+    key = (path, size, bold, italic, underline)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(path, size)
+        font.set_bold(bold)
+        font.set_italic(italic)
+        font.set_underline(underline)
+        _fonts[key] = font
+    return font
+
+
+def render_text(font, text, color, antialias=True):
+    """
+    font.render(text, antialias, color), cached. The surface is shared: callers
+    may set_alpha on it for a blit but must reset it (set_alpha(None)) after.
+    """
+    key = (font, text, tuple(color), antialias)
+    return _text_cache.get(key, None, lambda _: font.render(text, antialias, color))
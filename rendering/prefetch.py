@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from character_renderer import is_layer_cached, layer_paths, store_layer
+from conductor import chart_path
+from tools.loader import load_chart
+from tools.xml_sprite_loader import finish_character_sprites, finish_sprites, read_sheet
+
+
+def _decode(path):
+    try:
+        return pygame.image.load(path)
+    except Exception as e:
+        print(f"[prefetch] Failed to load {path}: {e}")
+        return None
+
+
+class Prefetcher:
+    def __init__(self, story, background_manager, game_sheets=None, lookahead=5):
+        """
+        Warms caches for the next pages of the story before they are shown.
+
+        update(page) scans the next lookahead pages for backgrounds, character
+        layers and "game" pages, and queues their file reads / decodes on a
+        worker thread (backgrounds through BackgroundManager.preload). pump()
+        runs on the main thread once per frame and finishes whatever is done:
+        convert() into the background and character layer caches, and views
+        into minigame sheet atlases (cut and saved on the worker).
+
+        game_sheets: {name: (png path, xml path, scale, character)} read when a
+            game page is coming up; its chart is compiled/warmed as well
+        """
+        self.story = story
+        self.background_manager = background_manager
+        self.game_sheets = game_sheets or {}
+        self.lookahead = lookahead
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self.pending = []     # (finish callable, future), finished by pump() on the main thread
+        self.requested = set()
+        self.scanned_page = None
+
+    def _queue(self, key, finish, fn, *args):
+        if key in self.requested:
+            return
+        self.requested.add(key)
+        self.pending.append((finish, self.executor.submit(fn, *args)))
+
+    def update(self, current_page):
+        """Queue everything the next pages need; cheap to call every frame."""
+        if current_page == self.scanned_page:
+            return
+        self.scanned_page = current_page
+        for page in self.story[current_page:current_page + self.lookahead + 1]:
+            background = page.get('background')
+            if background and background.lower() != "sudden":
+                self.background_manager.preload(background)
+
+            for path in layer_paths(page):
+                if not is_layer_cached(path):
+                    self._queue(("layer", path), self._finish_layer(path), _decode, path)
+
+            if page.get('type') == 'game':
+                song_name = page.get('song', "tutorial")
+                self._queue(("chart", song_name), None, load_chart, chart_path(song_name), "fnf")
+                for name, (image_path, xml_path, scale, character) in self.game_sheets.items():
+                    finish = finish_character_sprites if character else finish_sprites
+                    self._queue(("sheet", name), finish, read_sheet, image_path, xml_path, scale, character)
+
+    def _finish_layer(self, path):
+        def finish(image):
+            if not is_layer_cached(path):
+                store_layer(path, image)
+        return finish
+
+    def pump(self, max_items=2):
+        """Finish up to max_items completed jobs (main thread; never waits on the worker)."""
+        self.background_manager.pump()
+        finished = 0
+        for entry in list(self.pending):
+            if finished >= max_items:
+                break
+            finish, future = entry
+            if not future.done():
+                continue
+            self.pending.remove(entry)
+            finished += 1
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[prefetch] {e}")
+                continue
+            if finish is not None:
+                finish(result)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.background_manager.shutdown()
@@ -1,13 +1,14 @@
 import pygame
 import re
 
+from rendering.fonts import get_font, render_text
+
 class TextManager:
     def __init__(self, font_path="assets/fonts/VarelaRound-Regular.ttf", font_size=24, max_width=760):
         self.font_path = font_path
         self.font_size = font_size
-        self.font = pygame.font.Font(font_path, font_size)
+        self.font = get_font(font_path, font_size)
         self.max_width = max_width
-        self.font_cache = {}  # (bold, italic, underline) -> font
         self.reset()
 
     # --------------------
@@ -93,7 +94,7 @@ class TextManager:
                     while remaining:
                         take = self._fit_prefix_with_font(font, remaining, max_width)
                         part = remaining[:take]
-                        part_surf = font.render(part, True, chunk_color)
+                        part_surf = render_text(font, part, chunk_color)
                         screen.blit(part_surf, (x, y))
                         y += self.font.get_linesize()
                         # Trim leading spaces to avoid indenting next line
@@ -117,7 +118,7 @@ class TextManager:
                         while remaining:
                             take = self._fit_prefix_with_font(font, remaining, max_width)
                             part = remaining[:take]
-                            part_surf = font.render(part, True, chunk_color)
+                            part_surf = render_text(font, part, chunk_color)
                             if len(remaining) > take:
                                 screen.blit(part_surf, (x, y))
                                 y += self.font.get_linesize()
@@ -148,14 +149,7 @@ class TextManager:
     # Internals
     # --------------------
     def _get_styled_font(self, bold=False, italic=False, underline=False):
-        key = (bold, italic, underline)
-        if key not in self.font_cache:
-            font = pygame.font.Font(self.font_path, self.font_size)
-            font.set_bold(bold)
-            font.set_italic(italic)
-            font.set_underline(underline)
-            self.font_cache[key] = font
-        return self.font_cache[key]
+        return get_font(self.font_path, self.font_size, bold, italic, underline)
 
     def _fit_prefix_with_font(self, font, text, max_width):
         """
@@ -209,13 +203,13 @@ class TextManager:
             biu = self._parse_biu(inner)
             inner_text, bold, italic, underline = biu
             font = self._get_styled_font(bold, italic, underline)
-            surface = font.render(inner_text, True, chunk_color)
+            surface = render_text(font, inner_text, chunk_color)
             return surface, inner_text, (font, chunk_color)
 
         # No color: parse BIU combos on the whole segment
         inner_text, bold, italic, underline = self._parse_biu(text)
         font = self._get_styled_font(bold, italic, underline)
-        surface = font.render(inner_text, True, chunk_color)
+        surface = render_text(font, inner_text, chunk_color)
         return surface, inner_text, (font, chunk_color)
 
     def _parse_biu(self, text):
@@ -1,5 +1,7 @@
 import pygame
 
+from tools.draw_list import centered
+
 DEFAULT_SPRITE_KEYS = {
     'left': {
         'idle':  "arrow static instance 10000",
@@ -69,8 +71,7 @@ class Arrow:
         else:
             frame = self.idle
 
-        rect = frame.get_rect(center=self.position)
-        screen.blit(frame, rect.topleft)
+        screen.blit(frame, centered(frame, self.position))
         self.splash.draw(screen)
 
     def set_position(self, pos):
@@ -193,8 +194,6 @@ class Splash:
     def draw(self, screen):
         if not self.active:
             return
-        alpha = int(255 * (self.timer / self.duration))
-        faded = self.surface.copy()
-        faded.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
-        rect = faded.get_rect(center=self.position)
-        screen.blit(faded, rect.topleft)
+        # Surface alpha fades the cached circle without copying it every frame
+        self.surface.set_alpha(int(255 * (self.timer / self.duration)))
+        screen.blit(self.surface, centered(self.surface, self.position))
@@ -0,0 +1,48 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+
+class AssetLoader:
+    def __init__(self, max_workers=None):
+        """
+        Loads assets on a thread pool and hands back futures.
+
+        Workers only do the parts that need no display: file reads, hashing,
+        PNG/OGG decode, XML and chart parsing. Anything that touches the
+        display (convert(), subsurfaces, scaling into screen surfaces) is
+        finished on the main thread once the future is done, so the window can
+        keep pumping events and drawing a loading screen meanwhile.
+        """
+        if max_workers is None:
+            max_workers = min(8, os.cpu_count() or 2)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="asset")
+        self.futures = {}
+
+    def submit(self, name, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on a worker; its result is later fetched by name."""
+        future = self.executor.submit(fn, *args, **kwargs)
+        self.futures[name] = future
+        return future
+
+    def image(self, name, path):
+        """Decode an image on a worker; convert() the result on the main thread."""
+        return self.submit(name, pygame.image.load, path)
+
+    def progress(self):
+        """Fraction of submitted jobs that have finished (1.0 with none submitted)."""
+        if not self.futures:
+            return 1.0
+        return sum(future.done() for future in self.futures.values()) / len(self.futures)
+
+    def done(self):
+        return all(future.done() for future in self.futures.values())
+
+    def result(self, name):
+        """Block until the named job finishes; re-raises its exception if it failed."""
+        return self.futures[name].result()
+
+    def shutdown(self, wait=False):
+        """Stop the workers; jobs that have not started yet are cancelled."""
+        self.executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,42 @@
+from tools.judgement import JUDGEMENT_WINDOWS
+
+# Actions in a schedule entry. Releases sort before presses at the same time.
+RELEASE = 0
+PRESS = 1
+
+
+class BotSchedule:
+    def __init__(self, chart, tap_hold_ms=80):
+        """
+        Precomputed press/release timeline for a bot playing a chart.
+
+        chart: dict of direction -> NoteTable (as returned by tools.loader)
+        tap_hold_ms: how long the bot keeps a tap note's arrow pressed
+
+        events: sorted list of (time_ms, action, direction, note_index).
+        The bot presses as soon as a note enters the 'sick' window, holds
+        taps for tap_hold_ms and hold notes until their tail, and always
+        lets go before its next press in the same lane.
+        """
+        self.events = []
+        press_lead = JUDGEMENT_WINDOWS['sick']
+        for direction, table in chart.items():
+            presses = [t - press_lead for t in table.time]
+            for i, press_time in enumerate(presses):
+                sustain = table.sustain[i]
+                release_time = table.time[i] + sustain if sustain > 0 else press_time + tap_hold_ms
+                if i + 1 < len(presses):
+                    release_time = min(release_time, presses[i + 1])
+                self.events.append((press_time, PRESS, direction, i))
+                self.events.append((release_time, RELEASE, direction, i))
+        self.events.sort()
+
+    def __len__(self):
+        return len(self.events)
+
+    def due(self, cursor, song_time):
+        """Return the cursor past every event at or before song_time."""
+        events = self.events
+        while cursor < len(events) and events[cursor][0] <= song_time:
+            cursor += 1
+        return cursor
@@ -1,17 +1,25 @@
+from functools import partial
+
 import pygame
 
+from tools.frame_cache import frame_cache
+from tools.sprite_atlas import SpriteFrame
+
 BASE_WIDTH = 1280
 BASE_HEIGHT = 720
 DEFAULT_FPS = 24  # frame rate per animation
 
 class CharacterAnimator:
-    def __init__(self, sprite_map: dict, position: tuple):
+    def __init__(self, sprite_map: dict, position: tuple, sheet_id=None):
         """
-        sprite_map: dict of state name → list[Surface]
+        sprite_map: dict of state name → list[SpriteFrame or Surface]
             Required: 'idle', 'singLEFT', 'singDOWN', 'singUP', 'singRIGHT'
         position: (x, y) on screen at 1280x720 base
+        sheet_id: key under which scaled frames are shared in tools.frame_cache;
+            animators built from the same sheet should pass the same id
         """
         self.sprite_map = sprite_map
+        self.sheet_id = id(sprite_map) if sheet_id is None else sheet_id
         self.base_pos = position
         self.scaled_pos = position
         self.scale = 1.0
@@ -23,10 +31,11 @@ class CharacterAnimator:
         self.frame_index = 0
         self.frame_timer = self.anim_time
 
-        self.scaled_frames = {
-            state: frames[:] for state, frames in sprite_map.items()
+        self.frames = {
+            state: [f if isinstance(f, SpriteFrame) else SpriteFrame(f) for f in frames]
+            for state, frames in sprite_map.items()
         }
-        self._rescale_all_frames()
+        self._make_scaled = None
 
     def play(self, direction: str):
         """Start playing a directional animation"""
@@ -47,7 +56,7 @@ class CharacterAnimator:
         self.held = False
 
     def update(self, dt):
-        frames = self.scaled_frames.get(self.current_state)
+        frames = self.frames.get(self.current_state)
         if not frames:
             return
 
@@ -63,25 +72,36 @@ class CharacterAnimator:
             self.frame_timer = self.anim_time
 
     def draw(self, screen):
-        frames = self.scaled_frames.get(self.current_state)
+        frames = self.frames.get(self.current_state)
         if frames:
-            frame = frames[self.frame_index % len(frames)]
-            rect = frame.get_rect(midbottom=self.scaled_pos)
-            screen.blit(frame, rect.topleft)
+            index = self.frame_index % len(frames)
+            frame = frames[index]
+            if self._make_scaled is not None:
+                # Scaled on first draw, then shared with every animator of this sheet:
+                # keyed by (sheet id, state, frame index, scale), the source frame guards reused ids
+                key = (self.sheet_id, self.current_state, index, self.scale)
+                frame = frame_cache.get(key, frame, self._make_scaled)
+            # The untrimmed frame sits midbottom on scaled_pos; the trimmed pixels at offset inside it
+            x = self.scaled_pos[0] - frame.size[0] // 2 + frame.offset[0]
+            y = self.scaled_pos[1] - frame.size[1] + frame.offset[1]
+            screen.blit(frame.surface, (x, y))
 
     def rescale(self, screen_size):
         scale_x = screen_size[0] / BASE_WIDTH
         scale_y = screen_size[1] / BASE_HEIGHT
         self.scale = min(scale_x, scale_y)
         self.scaled_pos = (int(self.base_pos[0] * self.scale), int(self.base_pos[1] * self.scale))
-        self._rescale_all_frames()
+        # At 1.0 the atlas views are drawn as they are, no copies
+        self._make_scaled = None if self.scale == 1.0 else partial(scale_frame, scale=self.scale)
+
 
-    def _rescale_all_frames(self):
-        self.scaled_frames = {}
-        for state, frames in self.sprite_map.items():
-            self.scaled_frames[state] = [
-                pygame.transform.smoothscale(frame, (
-                    int(frame.get_width() * self.scale),
-                    int(frame.get_height() * self.scale)
-                )) for frame in frames
-            ]
+def scale_frame(frame, scale):
+    surface = frame.surface
+    return SpriteFrame(
+        pygame.transform.smoothscale(surface, (
+            max(1, int(surface.get_width() * scale)),
+            max(1, int(surface.get_height() * scale))
+        )),
+        (int(frame.offset[0] * scale), int(frame.offset[1] * scale)),
+        (int(frame.size[0] * scale), int(frame.size[1] * scale))
+    )
@@ -0,0 +1,101 @@
+import pygame
+
+# id(surface) -> (surface, half_width, half_height, height); the surface is kept so ids can't be reused
+_anchor_cache = {}
+_ANCHOR_CACHE_LIMIT = 4096
+
+
+def _anchors(surface):
+    entry = _anchor_cache.get(id(surface))
+    if entry is None or entry[0] is not surface:
+        if len(_anchor_cache) >= _ANCHOR_CACHE_LIMIT:
+            _anchor_cache.clear()
+        w, h = surface.get_size()
+        entry = (surface, w // 2, h // 2, h)
+        _anchor_cache[id(surface)] = entry
+    return entry
+
+
+def centered(surface, center):
+    """Top-left blit position that centers surface on center (like get_rect(center=...))."""
+    _, half_w, half_h, _ = _anchors(surface)
+    return int(center[0]) - half_w, int(center[1]) - half_h
+
+
+def midbottom(surface, pos):
+    """Top-left blit position for surface with its bottom-center at pos."""
+    _, half_w, _, h = _anchors(surface)
+    return int(pos[0]) - half_w, int(pos[1]) - h
+
+
+class DrawList:
+    """Collects one frame's blits and submits them with a single Surface.blits call.
+
+    Stands in for the target surface: anything that draws with screen.blit(...)
+    and reads the screen size can be handed a DrawList instead.
+    """
+
+    def __init__(self, target):
+        self.target = target
+        self.items = []
+
+    def blit(self, surface, dest, area=None):
+        if area is None:
+            self.items.append((surface, dest))
+        else:
+            self.items.append((surface, dest, area))
+
+    def get_width(self):
+        return self.target.get_width()
+
+    def get_height(self):
+        return self.target.get_height()
+
+    def get_size(self):
+        return self.target.get_size()
+
+    def flush(self):
+        """Draw everything queued this frame, in order, and start a new frame."""
+        if self.items:
+            self.target.blits(self.items, doreturn=False)
+            self.items.clear()
+
+
+if __name__ == "__main__":
+    # Benchmark: per-sprite get_rect + blit vs. DrawList on a rhythm-screen sized load
+    import os
+    import random
+    import time
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+
+    sprites = []
+    for size in (40, 70, 110, 160):
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(surf, (200, 80, 255, 200), (size // 2, size // 2), size // 2)
+        sprites.append(surf)
+    # Two lanes: receptors, notes, hold pieces, splashes, characters
+    draws = [(random.choice(sprites), (random.randint(0, 1280), random.randint(0, 720))) for _ in range(400)]
+    frames = 300
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        for surf, center in draws:
+            rect = surf.get_rect(center=center)
+            screen.blit(surf, rect.topleft)
+    individual = (time.perf_counter() - start) * 1000 / frames
+
+    draw_list = DrawList(screen)
+    start = time.perf_counter()
+    for _ in range(frames):
+        for surf, center in draws:
+            draw_list.blit(surf, centered(surf, center))
+        draw_list.flush()
+    batched = (time.perf_counter() - start) * 1000 / frames
+
+    print(f"{len(draws)} sprites/frame over {frames} frames")
+    print(f"individual blit: {individual:.3f} ms/frame")
+    print(f"DrawList.flush:  {batched:.3f} ms/frame ({individual - batched:+.3f} ms saved)")
+    pygame.quit()
@@ -1,17 +1,26 @@
 class EventHandler:
-    def __init__(self, events, conductor=None):
+    def __init__(self, events, conductor=None, preload_ms=2000):
         """
         events: List of [timestamp_ms, [[type, param1, param2], ...]]
         conductor: Optional reference for triggering engine actions.
+        preload_ms: How far ahead of a "vid" event its clip is preloaded.
         """
         self.events = sorted(events, key=lambda e: e[0])
         self.event_index = 0
+        self.preload_index = 0
+        self.preload_ms = preload_ms
         self.conductor = conductor
 
     def update(self, song_time):
         """
         Triggers all events whose timestamp has passed since last update.
         """
+        while (self.preload_index < len(self.events) and
+               song_time + self.preload_ms >= self.events[self.preload_index][0]):
+            for event in self.events[self.preload_index][1]:
+                if event[0] == "vid" and self.conductor:
+                    self.conductor.preload_video(event[1] or "assets/video/default.mp4")
+            self.preload_index += 1
         while (self.event_index < len(self.events) and
                song_time >= self.events[self.event_index][0]):
             timestamp, event_list = self.events[self.event_index]
@@ -37,3 +46,4 @@ class EventHandler:
 
     def reset(self):
         self.event_index = 0
+        self.preload_index = 0
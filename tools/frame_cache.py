@@ -0,0 +1,91 @@
+from collections import OrderedDict
+
+from tools.sprite_atlas import SpriteFrame
+
+DEFAULT_BUDGET_BYTES = 128 * 2**20
+
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class FrameCache:
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES):
+        """
+        LRU cache of Surfaces (or SpriteFrames) bounded by their pixel bytes.
+
+        Keys are any hashable the caller chooses; each instance documents its
+        own. Once the cache holds more than budget_bytes of pixels, the least
+        recently used entries are dropped.
+        """
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        # key -> (source, value, bytes); the source an entry was built from is
+        # kept so a key that gets reused (e.g. one holding the id() of a freed
+        # object) can't return a stale value
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, source, make):
+        """Cached value for key, calling make(source) to build it on a miss.
+        source may be None for entries that depend only on their key."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is source:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        frame = make(source)
+        self.put(key, frame, source)
+        return frame
+
+    def peek(self, key):
+        """Cached value for key, or None; counts as a use but never builds anything."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def __contains__(self, key):
+        """Whether key has an entry (possibly a remembered None); not counted as a use."""
+        return key in self._entries
+
+    def put(self, key, frame, source=None):
+        if frame is None:
+            size = 0  # Remembered failure (e.g. a missing image)
+        else:
+            size = surface_bytes(frame.surface if isinstance(frame, SpriteFrame) else frame)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.used_bytes -= old[2]
+        self._entries[key] = (source, frame, size)
+        self.used_bytes += size
+        self._evict()
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone is over budget
+        while self.used_bytes > self.budget_bytes and len(self._entries) > 1:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self.used_bytes -= size
+
+    def set_budget(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def discard_sheet(self, sheet_id):
+        """Drop every entry whose key starts with sheet_id, i.e. every frame of one
+        sheet in frame_cache (e.g. when its character leaves for good)."""
+        for key in [k for k in self._entries if k[0] == sheet_id]:
+            self.used_bytes -= self._entries.pop(key)[2]
+
+    def clear(self):
+        self._entries.clear()
+        self.used_bytes = 0
+
+
+# Scaled animation frames shared by every CharacterAnimator, keyed by
+# (sheet id, animation state, frame index, scale)
+frame_cache = FrameCache()
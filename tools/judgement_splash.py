@@ -1,4 +1,5 @@
-import pygame
+from rendering.fonts import get_font, render_text
+from tools.draw_list import centered
 
 class JudgementSplash:
     COLORS = {
@@ -9,7 +10,7 @@ class JudgementSplash:
         "ABYSMAL DOGSHIT": (170, 90, 255)
     }
     def __init__(self, font_size=96, duration=600, center=(640, 200)):
-        self.font = pygame.font.Font(None, font_size)
+        self.font = get_font(None, font_size)
         self.duration = duration
         self.center = center
         self.text = None
@@ -34,7 +35,8 @@ class JudgementSplash:
 
     def draw(self, screen):
         if self.text:
-            surf = self.font.render(self.text, True, self.color)
+            # Cached per word; fade with per-surface alpha, reset so the shared surface stays opaque
+            surf = render_text(self.font, self.text, self.color)
             surf.set_alpha(self.alpha)
-            rect = surf.get_rect(center=self.center)
-            screen.blit(surf, rect)
+            screen.blit(surf, centered(surf, self.center))
+            surf.set_alpha(None)
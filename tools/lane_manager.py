@@ -3,7 +3,8 @@ from tools.chart_handler import ChartHandler
 from tools.note_handler import NoteHandler, render_notes
 from tools.arrow_handler import ArrowHandler
 from tools.character_animations import CharacterAnimator
-from tools.judgement import JUDGEMENT_WINDOWS
+from tools.bot_schedule import BotSchedule, PRESS
+from tools.note import ScrollMap
 
 class LaneManager:
     def __init__(
@@ -20,10 +21,12 @@ class LaneManager:
         bpm=120,
         song_speed=1.0,
         section_list=None,
+        scroll_map=None,
         key_map=None,
         lane_positions=None,
         judgement_splash=None,
-        scroll_speed=0.3
+        scroll_speed=0.3,
+        bot_schedule=None
     ):
         self.name = name
         self.is_player = is_player
@@ -34,6 +37,11 @@ class LaneManager:
         self.song_speed = song_speed
 
         self.section_list = section_list or []
+        self.scroll_map = scroll_map or ScrollMap(self.section_list, bpm=bpm, song_speed=song_speed)
+        # Own play state per lane, even when several lanes share a chart
+        chart = {direction: table.copy() for direction, table in chart.items()}
+        for table in chart.values():
+            table.set_scroll_map(self.scroll_map)
 
         self.chart_handler = ChartHandler(chart)
         self.arrow_handler = ArrowHandler(
@@ -45,8 +53,13 @@ class LaneManager:
         )
         self.animator = animator
 
-        self.ai_press_timers = {}  # direction: release_time_ms
-        self.ai_hold_releases = {}  # direction: release_time
+        self.chart = chart
+        # Bot lanes replay a precomputed press/release timeline; several lanes may share one
+        if not is_player:
+            self.bot_schedule = bot_schedule or BotSchedule(chart)
+        else:
+            self.bot_schedule = None
+        self.bot_cursor = 0
 
         self.hit_y = hit_y
         self.scroll_speed = scroll_speed
@@ -65,49 +78,28 @@ class LaneManager:
 
     def update(self, song_time, dt):
         self.chart_handler.update(song_time, self.note_handler, prebuffer=2500)
+        if self.bot_schedule is not None:
+            # Before note_handler.update, so a long frame can't expire a note the bot is due to hit
+            self.simple_opponent_ai(song_time)
         self.note_handler.update(song_time)
         self.arrow_handler.update(dt)
         self.animator.update(dt)
-        if not self.is_player:
-            self.simple_opponent_ai(song_time)
-        # Release bot arrows if their timer has expired
-        # Tap note releases
-        to_release = []
-        for direction, release_time in self.ai_press_timers.items():
-            if song_time >= release_time:
-                self.arrow_handler.release(direction)
-                self.animator.release()
-                to_release.append(direction)
-        for direction in to_release:
-            del self.ai_press_timers[direction]
 
-        # Hold note releases
-        to_release_hold = []
-        for direction, release_time in self.ai_hold_releases.items():
-            if song_time >= release_time:
-                self.arrow_handler.release(direction)
-                self.animator.release()
-                # Release the held flag in the note itself (mark as not held)
-                for note in self.note_handler.notes_by_lane[direction]:
-                    if note.is_hold() and note.hit and note.held and not note.missed:
-                        note.held = False
-                to_release_hold.append(direction)
-        for direction in to_release_hold:
-            del self.ai_hold_releases[direction]
-
-    def draw(self, song_time):
-        self.animator.draw(self.screen)
+    def draw(self, song_time, target=None):
+        """Draw into target (the screen, or a DrawList batching the frame)."""
+        target = target or self.screen
+        self.animator.draw(target)
         render_notes(
-            self.screen,
+            target,
             self.note_handler,
             song_time=song_time,
             hit_y=self.hit_y,
             arrow_frames=self.frames,
             lane_positions=self.lane_positions,
-            section_list=self.section_list,  # <--- NEW
+            scroll_map=self.scroll_map,
             base_pixels_per_beat=self.base_pixels_per_beat
         )
-        self.arrow_handler.draw(self.screen)
+        self.arrow_handler.draw(target)
 
     def handle_input(self, event, song_time):
         if not self.is_player:
@@ -123,25 +115,28 @@ class LaneManager:
             self.note_handler.handle_key_release(direction)
 
     def simple_opponent_ai(self, song_time):
-        # "Bot" logic: hit notes perfectly in the 'sick' window
-        for direction, notes in self.note_handler.notes_by_lane.items():
-            for note in notes:
+        # "Bot" logic: hit notes perfectly in the 'sick' window, following the schedule
+        schedule = self.bot_schedule
+        end = schedule.due(self.bot_cursor, song_time)
+        for i in range(self.bot_cursor, end):
+            _, action, direction, index = schedule.events[i]
+            note = self.chart[direction].note(index)
+            if action == PRESS:
                 if note.hit or note.missed:
                     continue
-                diff = abs(song_time - note.time_ms)
-                if diff <= JUDGEMENT_WINDOWS['sick']:
-                    note.hit = True
-                    note.judgement = 'sick'
-                    self.arrow_handler.press(direction, with_note=True, judgement='sick')
-                    self.animator.play(direction)
-                    # If hold note, start holding and schedule release
-                    if note.is_hold():
-                        note.held = True
-                        self.ai_hold_releases[direction] = note.get_tail_time()
-                    else:
-                        # Tap note: release after a short delay (like before)
-                        self.ai_press_timers[direction] = song_time + 80
-                    break  # One note per lane per frame
+                note.hit = True
+                note.judgement = 'sick'
+                self.arrow_handler.press(direction, with_note=True, judgement='sick')
+                self.animator.play(direction)
+                if note.is_hold():
+                    self.note_handler.start_hold(note)
+            else:
+                self.arrow_handler.release(direction)
+                self.animator.release()
+                if note.is_hold():
+                    # Release the held flag in the note itself (mark as not held)
+                    self.note_handler.release_holds(direction)
+        self.bot_cursor = end
 
     def get_song_time(self):
         # Optionally override this to sync with global song time
@@ -1,4 +1,22 @@
+import hashlib
 import json
+import os
+import struct
+from array import array
+
+from tools.note import NoteTable
+
+DIRECTIONS = ("left", "down", "up", "right")
+
+# --- Compiled chart cache ---
+# A compiled chart sits next to its source JSON (fakebaby.json -> fakebaby.chartc)
+# and holds the already-split notes as per-direction columns, so loading a song
+# is one read plus a handful of array.frombytes calls instead of a JSON parse.
+CHART_CACHE_EXT = ".chartc"
+CHART_CACHE_MAGIC = b"SIGCHRT2"
+# magic, source mtime_ns, source sha1, global bpm, global speed, meta json length
+_CACHE_HEADER = struct.Struct("<8sq20sddI")
+_COUNT = struct.Struct("<I")
 
 def load_default_chart(path):
     """ Load the default chart from the given path. """
@@ -15,7 +33,8 @@ def load_default_chart(path):
     return global_bpm, global_speed, player_notes, opponent_notes, raw, section_list, events
 
 def load_fnf_chart(path):
-    """Loads an FNF-style JSON and returns bpm, song_speed, player_notes, opponent_notes, song_meta, section_list"""
+    """Loads an FNF-style JSON and returns bpm, song_speed, player_notes, opponent_notes, song_meta, section_list.
+    player_notes/opponent_notes are dicts of direction -> NoteTable."""
     with open(path, 'r') as f:
         raw = json.load(f)
     song = raw.get("song", {})
@@ -29,13 +48,14 @@ def load_fnf_chart(path):
     section_list = build_section_table(sections, global_bpm, global_speed)
     return global_bpm, global_speed, player_notes, opponent_notes, song, section_list, events
 
+def new_note_tables():
+    """One empty NoteTable per direction."""
+    return {d: NoteTable(d) for d in DIRECTIONS}
+
 def split_fnf_chart_sections_with_bpm_speed(sections, global_bpm, global_speed):
-    player_notes = []
-    opponent_notes = []
-    direction_map = {
-        0: "left", 1: "down", 2: "up", 3: "right",
-        4: "left", 5: "down", 6: "up", 7: "right"
-    }
+    """Returns (player_notes, opponent_notes), each a dict of direction -> NoteTable."""
+    player_notes = new_note_tables()
+    opponent_notes = new_note_tables()
 
     current_bpm = global_bpm
     current_speed = global_speed
@@ -50,23 +70,16 @@ def split_fnf_chart_sections_with_bpm_speed(sections, global_bpm, global_speed):
         must_hit = section.get("mustHitSection", False)
         for note in section.get("sectionNotes", []):
             time, lane, sustain = note
-            note_obj = {
-                "direction": direction_map[lane],
-                "time": int(time),
-                "sustain": sustain,
-                "bpm": current_bpm,
-                "song_speed": current_speed,
-            }
-            if must_hit:
-                if lane in (0, 1, 2, 3):
-                    player_notes.append(note_obj)
-                elif lane in (4, 5, 6, 7):
-                    opponent_notes.append(note_obj)
+            # Lanes 0-3 belong to whoever the section focuses, 4-7 to the other side
+            if (lane < 4) == bool(must_hit):
+                side = player_notes
             else:
-                if lane in (0, 1, 2, 3):
-                    opponent_notes.append(note_obj)
-                elif lane in (4, 5, 6, 7):
-                    player_notes.append(note_obj)
+                side = opponent_notes
+            side[DIRECTIONS[lane % 4]].append(int(time), sustain, current_bpm, current_speed)
+
+    for tables in (player_notes, opponent_notes):
+        for table in tables.values():
+            table.sort()
     return player_notes, opponent_notes
 
 def split_chart_sections_with_bpm_speed(sections, global_bpm, global_speed, characters):
@@ -114,11 +127,18 @@ def split_chart_sections_with_bpm_speed(sections, global_bpm, global_speed, char
     return character_notes
 
 def build_section_table(sections, global_bpm, global_speed):
+    """Section windows on the song timeline. Uses the effective BPM and scroll speed
+    the same way the note splitters do: a section's "bpm" only applies with
+    "changeBPM", and "scrollSpeed" carries forward until the next one."""
     section_list = []
     current_time = 0
+    bpm = global_bpm
+    scroll_speed = global_speed
     for section in sections:
-        bpm = section.get("bpm", global_bpm)
-        scroll_speed = section.get("scrollSpeed", global_speed)
+        if section.get("changeBPM"):
+            bpm = section.get("bpm", bpm)
+        if "scrollSpeed" in section:
+            scroll_speed = section["scrollSpeed"]
         length_steps = section.get("lengthInSteps", 16)
         # In FNF: 4 steps = 1 beat, so 16 steps = 4 beats
         beats = length_steps / 4
@@ -139,6 +159,136 @@ def build_section_table(sections, global_bpm, global_speed):
 
     return section_list
 
+def notes_outside_sections(sections, section_list):
+    """Notes of the raw chart sections whose time falls outside their own section's
+    window in section_list (should be none)."""
+    outside = []
+    for section, window in zip(sections, section_list):
+        for note in section.get("sectionNotes", []):
+            if not window["start_time"] - 1 <= note[0] <= window["end_time"] + 1:
+                outside.append(note)
+    return outside
+
+def chart_cache_path(path):
+    return os.path.splitext(path)[0] + CHART_CACHE_EXT
+
+def _file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).digest()
+
+def _pack_notes(tables):
+    """Serialize a dict of direction -> NoteTable as (time, sustain, bpm, speed) columns."""
+    chunks = []
+    for d in DIRECTIONS:
+        table = tables[d]
+        chunks.append(_COUNT.pack(len(table)))
+        chunks.extend(col.tobytes() for col in (table.time, table.sustain, table.bpm, table.speed))
+    return chunks
+
+def _unpack_notes(buf, offset):
+    """Inverse of _pack_notes. Returns (dict of direction -> NoteTable, new offset)."""
+    tables = {}
+    for d in DIRECTIONS:
+        (count,) = _COUNT.unpack_from(buf, offset)
+        offset += _COUNT.size
+        table = NoteTable(d)
+        for col in (table.time, table.sustain, table.bpm, table.speed):
+            nbytes = count * col.itemsize
+            col.frombytes(buf[offset:offset + nbytes])
+            offset += nbytes
+        table.reset()
+        tables[d] = table
+    return tables, offset
+
+def _pack_sections(section_list):
+    cols = (array('i'), array('i'), array('d'), array('d'))
+    for sec in section_list:
+        cols[0].append(sec["start_time"])
+        cols[1].append(sec["end_time"])
+        cols[2].append(sec["bpm"])
+        cols[3].append(sec["scroll_speed"])
+    return [_COUNT.pack(len(section_list))] + [col.tobytes() for col in cols]
+
+def _unpack_sections(buf, offset):
+    (count,) = _COUNT.unpack_from(buf, offset)
+    offset += _COUNT.size
+    cols = []
+    for typecode in ('i', 'i', 'd', 'd'):
+        col = array(typecode)
+        nbytes = count * col.itemsize
+        col.frombytes(buf[offset:offset + nbytes])
+        offset += nbytes
+        cols.append(col)
+    section_list = [
+        {"start_time": start, "end_time": end, "bpm": bpm, "scroll_speed": speed}
+        for start, end, bpm, speed in zip(*cols)
+    ]
+    return section_list, offset
+
+def compile_fnf_chart(path, cache_path=None):
+    """Parse an FNF JSON chart and write its compiled form next to it.
+    Returns the compiled bytes."""
+    cache_path = cache_path or chart_cache_path(path)
+    with open(path, 'rb') as f:
+        source = f.read()
+    stat = os.stat(path)
+    song = json.loads(source).get("song", {})
+    global_bpm = song.get("bpm", 120)
+    global_speed = song.get("speed", song.get("songSpeed", 1.0))
+    sections = song["notes"]
+    player_notes, opponent_notes = split_fnf_chart_sections_with_bpm_speed(
+        sections, global_bpm, global_speed
+    )
+    section_list = build_section_table(sections, global_bpm, global_speed)
+
+    # Everything except the notes (which are stored as columns) goes in as JSON
+    meta = json.dumps({k: v for k, v in song.items() if k != "notes"}).encode("utf-8")
+    chunks = [
+        _CACHE_HEADER.pack(CHART_CACHE_MAGIC, stat.st_mtime_ns, hashlib.sha1(source).digest(),
+                           global_bpm, global_speed, len(meta)),
+        meta,
+    ]
+    chunks += _pack_notes(player_notes)
+    chunks += _pack_notes(opponent_notes)
+    chunks += _pack_sections(section_list)
+    buf = b"".join(chunks)
+    try:
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(buf)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"[loader] Could not write chart cache {cache_path}: {e}")
+    return buf
+
+def _read_compiled_chart(buf):
+    _, _, _, global_bpm, global_speed, meta_len = _CACHE_HEADER.unpack_from(buf, 0)
+    offset = _CACHE_HEADER.size
+    song_meta = json.loads(buf[offset:offset + meta_len].decode("utf-8"))
+    offset += meta_len
+    player_notes, offset = _unpack_notes(buf, offset)
+    opponent_notes, offset = _unpack_notes(buf, offset)
+    section_list, offset = _unpack_sections(buf, offset)
+    events = song_meta.get("events", None)
+    return global_bpm, global_speed, player_notes, opponent_notes, song_meta, section_list, events
+
+def load_compiled_fnf_chart(path):
+    """Same return value as load_fnf_chart (song_meta without "notes"), but read from
+    the compiled cache. The cache is rebuilt when the source JSON changed: a matching
+    mtime is trusted, otherwise the content hash decides."""
+    cache_path = chart_cache_path(path)
+    try:
+        with open(cache_path, 'rb') as f:
+            buf = f.read()
+        magic, mtime_ns, digest = _CACHE_HEADER.unpack_from(buf, 0)[:3]
+    except (OSError, struct.error):
+        return _read_compiled_chart(compile_fnf_chart(path, cache_path))
+
+    if magic != CHART_CACHE_MAGIC or (
+            mtime_ns != os.stat(path).st_mtime_ns and digest != _file_digest(path)):
+        buf = compile_fnf_chart(path, cache_path)
+    return _read_compiled_chart(buf)
+
 # If I add more formats:
 def load_stepmania_chart(path):
     """Placeholder for StepMania .sm parser."""
@@ -153,10 +303,31 @@ def load_chart(path, fmt="default"):
     if fmt == "default":
         return load_default_chart(path)
     elif fmt == "fnf":
-        return load_fnf_chart(path)
+        return load_compiled_fnf_chart(path)
     elif fmt == "stepmania":
         return load_stepmania_chart(path)
     elif fmt == "osu":
         return load_osu_chart(path)
     else:
         raise ValueError(f"Unsupported chart format: {fmt}")
+
+if __name__ == "__main__":
+    # Offline compile step: build the .chartc cache for every song.
+    import sys
+
+    songs_dir = sys.argv[1] if len(sys.argv) > 1 else "assets/minigame/songs"
+    for song_name in sorted(os.listdir(songs_dir)):
+        chart_path = os.path.join(songs_dir, song_name, f"{song_name}.json")
+        if not os.path.exists(chart_path):
+            continue
+        with open(chart_path, 'r') as f:
+            song = json.load(f).get("song")
+        if song is None:
+            continue  # default-format chart, nothing to compile
+        buf = compile_fnf_chart(chart_path)
+        print(f"Compiled {chart_path} -> {chart_cache_path(chart_path)}")
+        # Sanity check: every note lies inside its section's window on the timeline
+        section_list = _read_compiled_chart(buf)[5]
+        outside = notes_outside_sections(song["notes"], section_list)
+        if outside:
+            print(f"  WARNING: {len(outside)} notes fall outside their section, e.g. {outside[0]}")
@@ -1,18 +1,146 @@
-class Note:
-    def __init__(self, direction, time_ms, bpm, song_speed, sustain_ms=0):
+from array import array
+from bisect import bisect_right
+
+# Per-note state bits in NoteTable.flags
+HIT = 1                 # Tap/initial hit
+MISSED = 2              # Missed entirely
+HELD = 4                # Key is currently being held
+RELEASED_EARLY = 8      # Released before end of sustain
+
+# Judgement labels are stored as small codes; 0 means "not judged yet"
+JUDGEMENT_LABELS = (None, 'sick', 'good', 'bad', 'abysmal dogshit', 'miss')
+JUDGEMENT_CODES = {label: code for code, label in enumerate(JUDGEMENT_LABELS)}
+
+
+class NoteTable:
+    """All notes of one lane (direction) as parallel columns, sorted by time.
+    Note ids are indices into these arrays; play state lives in the flag columns."""
+
+    def __init__(self, direction, times=(), sustains=(), bpms=(), speeds=()):
         self.direction = direction
-        self.time_ms = time_ms                  # Head time (when the note is hit)
-        self.sustain_ms = sustain_ms            # How long to hold (0 for tap notes)
-        self.hit = False                        # Tap/initial hit
-        self.missed = False                     # Missed entirely
-        self.held = False                       # Key is currently being held
-        self.released_early = False             # Released before end of sustain
-        self.judgement = None                   # Tap/initial judgement
-        self.hold_judgement = None              # Hold score (if you want to grade it)
-        self.bpm = bpm
-        self.song_speed = song_speed
+        self.time = array('i', times)
+        self.sustain = array('d', sustains)
+        self.bpm = array('d', bpms)
+        self.speed = array('d', speeds)
+        self.flags = bytearray(len(self.time))
+        self.judgement = bytearray(len(self.time))
+        self.hold_judgement = bytearray(len(self.time))
+        # Filled by set_scroll_map(): scroll position of each head and tail
+        self.scroll_map = None
+        self.head_pos = None
+        self.tail_pos = None
+
+    def __len__(self):
+        return len(self.time)
+
+    def append(self, time, sustain, bpm, speed):
+        self.time.append(time)
+        self.sustain.append(sustain)
+        self.bpm.append(bpm)
+        self.speed.append(speed)
+        self.flags.append(0)
+        self.judgement.append(0)
+        self.hold_judgement.append(0)
+
+    def sort(self):
+        """Stable sort of every column by note time."""
+        order = sorted(range(len(self.time)), key=self.time.__getitem__)
+        for name in ('time', 'sustain', 'bpm', 'speed'):
+            col = getattr(self, name)
+            setattr(self, name, array(col.typecode, [col[i] for i in order]))
+        self.flags = bytearray(self.flags[i] for i in order)
+        self.judgement = bytearray(self.judgement[i] for i in order)
+        self.hold_judgement = bytearray(self.hold_judgement[i] for i in order)
+
+    def reset(self):
+        """Clear play state so the chart can be replayed."""
+        n = len(self.time)
+        self.flags = bytearray(n)
+        self.judgement = bytearray(n)
+        self.hold_judgement = bytearray(n)
+
+    def copy(self):
+        """A table over the same note columns with its own, fresh play state,
+        so several lanes can play one chart independently."""
+        table = NoteTable(self.direction)
+        table.time, table.sustain, table.bpm, table.speed = self.time, self.sustain, self.bpm, self.speed
+        table.reset()
+        table.scroll_map, table.head_pos, table.tail_pos = self.scroll_map, self.head_pos, self.tail_pos
+        return table
+
+    def set_scroll_map(self, scroll_map):
+        """Precompute where every head and tail sits on the song's scroll track."""
+        self.scroll_map = scroll_map
+        self.head_pos = scroll_map.positions(self.time)
+        self.tail_pos = scroll_map.positions([t + s for t, s in zip(self.time, self.sustain)])
+
+    def note(self, index):
+        return Note(self, index)
+
+
+def _flag(bit):
+    def get(self):
+        return bool(self.table.flags[self.index] & bit)
+
+    def set(self, value):
+        if value:
+            self.table.flags[self.index] |= bit
+        else:
+            self.table.flags[self.index] &= ~bit & 0xFF
+    return property(get, set)
+
+
+def _judgement_column(name):
+    def get(self):
+        return JUDGEMENT_LABELS[getattr(self.table, name)[self.index]]
+
+    def set(self, label):
+        getattr(self.table, name)[self.index] = JUDGEMENT_CODES[label]
+    return property(get, set)
+
+
+class Note:
+    """Thin view of one row of a NoteTable."""
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    hit = _flag(HIT)
+    missed = _flag(MISSED)
+    held = _flag(HELD)
+    released_early = _flag(RELEASED_EARLY)
+    judgement = _judgement_column('judgement')              # Tap/initial judgement
+    hold_judgement = _judgement_column('hold_judgement')    # Hold score (if you want to grade it)
+
+    @property
+    def direction(self):
+        return self.table.direction
+
+    @property
+    def time_ms(self):
+        # Head time (when the note is hit)
+        return self.table.time[self.index]
+
+    @property
+    def sustain_ms(self):
+        # How long to hold (0 for tap notes)
+        return self.table.sustain[self.index]
+
+    @property
+    def bpm(self):
+        return self.table.bpm[self.index]
+
+    @property
+    def song_speed(self):
+        return self.table.speed[self.index]
 
     def get_screen_y(self, song_time, hit_y, base_pixels_per_beat=100):
+        scroll_map = self.table.scroll_map
+        if scroll_map is not None:
+            distance = self.table.head_pos[self.index] - scroll_map.position(song_time)
+            return hit_y + distance * base_pixels_per_beat
         beat_time = 60000 / self.bpm
         pixels_per_beat = base_pixels_per_beat * self.song_speed
         pixels_per_ms = pixels_per_beat / beat_time
@@ -24,6 +152,10 @@ class Note:
 
     def get_tail_screen_y(self, song_time, hit_y, base_pixels_per_beat=100):
         """Returns the y-coordinate for the tail (end) of the hold note."""
+        scroll_map = self.table.scroll_map
+        if scroll_map is not None:
+            distance = self.table.tail_pos[self.index] - scroll_map.position(song_time)
+            return hit_y + distance * base_pixels_per_beat
         beat_time = 60000 / self.bpm
         pixels_per_beat = base_pixels_per_beat * self.song_speed
         pixels_per_ms = pixels_per_beat / beat_time
@@ -41,40 +173,65 @@ class Note:
         rect = sprite.get_rect(center=(center_x, int(y)))
         screen.blit(sprite, rect.topleft)
 
-def get_screen_y_fnf(note_time, song_time, hit_y, section_list, base_pixels_per_beat=100):
-    # Find current and next section
-    current_section = None
-    next_section = None
-    for i, section in enumerate(section_list):
-        if section['start_time'] <= song_time < section['end_time']:
-            current_section = section
-            if i + 1 < len(section_list):
-                next_section = section_list[i + 1]
-            break
-    if not current_section:
-        # fallback: use the first section
-        current_section = section_list[0]
-
-    section_end = current_section['end_time']
-
-    if note_time <= section_end or not next_section:
-        # Note is in current section
-        dt = note_time - song_time
-        beat_time = 60000 / current_section['bpm']
-        pixels_per_beat = base_pixels_per_beat * current_section['scroll_speed']
-        pixels_per_ms = pixels_per_beat / beat_time
-        return hit_y + dt * pixels_per_ms
-    else:
-        # Note traverses both sections
-        dt0 = section_end - song_time
-        dt1 = note_time - section_end
-        # Segment 1 (current section)
-        beat_time0 = 60000 / current_section['bpm']
-        pixels_per_beat0 = base_pixels_per_beat * current_section['scroll_speed']
-        pixels_per_ms0 = pixels_per_beat0 / beat_time0
-        # Segment 2 (next section)
-        beat_time1 = 60000 / next_section['bpm']
-        pixels_per_beat1 = base_pixels_per_beat * next_section['scroll_speed']
-        pixels_per_ms1 = pixels_per_beat1 / beat_time1
-        # Total scroll
-        return hit_y + dt0 * pixels_per_ms0 + dt1 * pixels_per_ms1
+class ScrollMap:
+    """Cumulative scroll distance against song time, built once per song.
+
+    Position is measured in beats * scroll speed, so a note's screen y is
+    hit_y + (position(note_time) - position(song_time)) * base_pixels_per_beat,
+    whatever BPM or scroll-speed changes lie between the two.
+    """
+
+    def __init__(self, section_list, events=None, bpm=120, song_speed=1.0):
+        # Breakpoints where the scroll rate changes: section starts and scroll-speed events
+        changes = {}
+        for sec in section_list:
+            changes[sec["start_time"]] = (sec["bpm"], sec["scroll_speed"])
+        multipliers = {}
+        for timestamp, event_list in events or []:
+            for event in event_list:
+                if event[0] == "Change Scroll Speed":
+                    multipliers[timestamp] = float(event[1])
+
+        breakpoints = sorted(set(changes) | set(multipliers)) or [0]
+        self.times = array('d')
+        self.pos = array('d')
+        self.rate = array('d')  # position per ms after each breakpoint
+        current_bpm, current_speed, multiplier = bpm, song_speed, 1.0
+        if changes:
+            current_bpm, current_speed = changes[min(changes)]
+        position = 0.0
+        for t in breakpoints:
+            if self.times:
+                position += (t - self.times[-1]) * self.rate[-1]
+            current_bpm, current_speed = changes.get(t, (current_bpm, current_speed))
+            multiplier = multipliers.get(t, multiplier)
+            self.times.append(t)
+            self.pos.append(position)
+            self.rate.append(current_bpm * current_speed * multiplier / 60000)
+
+    def position(self, time_ms):
+        """Scroll position at time_ms (one bisect)."""
+        i = bisect_right(self.times, time_ms) - 1
+        if i < 0:
+            i = 0
+        return self.pos[i] + (time_ms - self.times[i]) * self.rate[i]
+
+    def positions(self, times_ms):
+        """Scroll positions for an ascending sequence of times in a single pass."""
+        out = array('d')
+        times, pos, rate = self.times, self.pos, self.rate
+        last = len(times) - 1
+        i = 0
+        for t in times_ms:
+            if t < times[i]:
+                i = max(0, bisect_right(times, t) - 1)  # input not ascending here
+            while i < last and times[i + 1] <= t:
+                i += 1
+            out.append(pos[i] + (t - times[i]) * rate[i])
+        return out
+
+
+def get_screen_y_fnf(note_time, song_time, hit_y, scroll_map, base_pixels_per_beat=100):
+    """scroll_map: the song's ScrollMap, built once (not a section_list)."""
+    distance = scroll_map.position(note_time) - scroll_map.position(song_time)
+    return hit_y + distance * base_pixels_per_beat
@@ -1,4 +1,7 @@
-from tools.note import get_screen_y_fnf
+import math
+from collections import deque
+
+from tools.draw_list import centered
 
 class NoteHandler:
     def __init__(self, judgement, arrow_handler, player_animator, judgement_splash=None):
@@ -7,12 +10,18 @@ class NoteHandler:
         self.player_animator = player_animator
         self.judgement_splash = judgement_splash
 
+        # Notes arrive from ChartHandler in time order, so each lane is a queue:
+        # finished notes are popped from the front, new ones appended at the back.
         self.notes_by_lane = {
-            'left': [],
-            'down': [],
-            'up': [],
-            'right': []
+            'left': deque(),
+            'down': deque(),
+            'up': deque(),
+            'right': deque()
         }
+        # Offset (into the lane) of the next note that can still be judged
+        self.cursor = {lane: 0 for lane in self.notes_by_lane}
+        # Hold notes whose head was hit and whose tail hasn't passed yet
+        self.holding = {lane: [] for lane in self.notes_by_lane}
 
     def _note_is_active(self, n, current_time):
         # Remove tap notes if hit or missed
@@ -27,57 +36,89 @@ class NoteHandler:
         # print(f"Spawning {note.direction} at {note.time_ms}")
         self.notes_by_lane[note.direction].append(note)
 
+    def start_hold(self, note):
+        """Mark a hit hold note as held and track it until its tail."""
+        note.held = True
+        self.holding[note.direction].append(note)
+
+    def release_holds(self, direction):
+        """Let go of every hold note currently held in a lane."""
+        for note in self.holding[direction]:
+            if note.held and not note.missed:
+                note.held = False
+
     def update(self, current_time):
-        """Clean up old notes, sort lanes, and handle hold-miss logic."""
-        for lane in self.notes_by_lane:
-            self.notes_by_lane[lane] = [
-                n for n in self.notes_by_lane[lane]
-                if self._note_is_active(n, current_time)
-            ]
-            self.notes_by_lane[lane].sort(key=lambda n: n.time_ms)
-            for note in self.notes_by_lane[lane]:
+        """Expire passed notes, drop finished ones, and handle hold-miss logic."""
+        miss_window = self.judgement.window("miss")
+        for lane, notes in self.notes_by_lane.items():
+            # Move the cursor past judged notes; anything not hit by the end of the miss window is missed
+            i = self.cursor[lane]
+            while i < len(notes):
+                note = notes[i]
+                if not note.hit and not note.missed:
+                    if note.time_ms + miss_window >= current_time:
+                        break
+                    note.missed = True
+                i += 1
+
+            # Finished notes collect at the front of the lane
+            while notes and not self._note_is_active(notes[0], current_time):
+                notes.popleft()
+                i = max(0, i - 1)
+            self.cursor[lane] = i
+
+            holding = self.holding[lane]
+            if not holding:
+                continue
+            still_holding = []
+            for note in holding:
+                if note.missed or current_time >= note.get_tail_time():
+                    continue
                 # FNF hold logic: If this is a hold note, was hit, but not being held, and it's not finished yet
-                if note.is_hold() and note.hit and not note.held and not note.missed:
-                    if current_time < note.get_tail_time():
-                        note.missed = True
-                        note.hold_judgement = 'miss'
-                        print(f"Hold note missed early on {lane} at {current_time}")
+                if not note.held:
+                    note.missed = True
+                    note.hold_judgement = 'miss'
+                    print(f"Hold note missed early on {lane} at {current_time}")
+                    continue
+                still_holding.append(note)
+            self.holding[lane] = still_holding
 
     def handle_key_press(self, direction, press_time):
         """Handle a key press and return True if a note was hit."""
-        lane = self.notes_by_lane.get(direction, [])
-        if not lane:
+        notes = self.notes_by_lane.get(direction)
+        if not notes:
             return False
 
-        for note in lane:
-            if note.hit or note.missed:
-                continue
-
-            result = self.judgement.evaluate(note, press_time)
-            print("You've Been Judged:", result)
+        # Only the cursor note can be judged; skip anything judged since the last update
+        i = self.cursor[direction]
+        while i < len(notes) and (notes[i].hit or notes[i].missed):
+            i += 1
+        self.cursor[direction] = i
+        if i >= len(notes):
+            return False
 
-            if self.judgement_splash:
-                self.judgement_splash.show(result)
+        note = notes[i]
+        if abs(press_time - note.time_ms) > self.judgement.window("miss"):
+            return False  # Nothing close enough to judge
 
-            if result != "miss":
-                note.hit = True
-                note.judgement = result
+        result = self.judgement.evaluate(note, press_time)
+        if self.judgement_splash:
+            self.judgement_splash.show(result)
+        if result == "miss":
+            return False
 
-                self.arrow_handler.press(direction, with_note=True, judgement=result)
-                self.player_animator.play(direction)
+        note.hit = True
+        note.judgement = result
+        self.cursor[direction] = i + 1
 
-                # FNF hold note logic: Only start "held" if we hit the head!
-                if note.is_hold():
-                    note.held = True
+        self.arrow_handler.press(direction, with_note=True, judgement=result)
+        self.player_animator.play(direction)
 
-                return True
-            else:
-                # Too late? mark as missed
-                if press_time - 20 > note.time_ms + self.judgement.window("miss"):
-                    note.missed = True
-                break
+        # FNF hold note logic: Only start "held" if we hit the head!
+        if note.is_hold():
+            self.start_hold(note)
 
-        return False
+        return True
 
     def handle_key_release(self, direction):
         self.arrow_handler.release(direction)
@@ -90,64 +131,78 @@ def render_notes(
     hit_y,
     arrow_frames,
     lane_positions,
-    section_list,
+    scroll_map,
     base_pixels_per_beat
 ):
     NOTE_SPAWN_TIME = 2500  # ms
+    scroll_now = scroll_map.position(song_time)
+    screen_height = screen.get_height()
 
     for direction, notes in note_handler.notes_by_lane.items():
+        if not notes:
+            continue
         x = lane_positions[direction]
         frameset = arrow_frames[direction]
 
-        for note in notes:
+        # A lane always holds consecutive rows of its NoteTable, so every head/tail
+        # position comes out of one slice of the precomputed scroll columns.
+        table = notes[0].table
+        first = notes[0].index
+        last = first + len(notes)
+        head_ys = [hit_y + (p - scroll_now) * base_pixels_per_beat for p in table.head_pos[first:last]]
+        tail_ys = [hit_y + (p - scroll_now) * base_pixels_per_beat for p in table.tail_pos[first:last]]
+
+        for note, y_head, y_tail in zip(notes, head_ys, tail_ys):
             time_until_hit = note.time_ms - song_time
             if time_until_hit > NOTE_SPAWN_TIME:
-                continue # Too early to show this note
-            if note.time_ms + 75 < song_time and (not note.is_hold() or song_time > note.get_tail_time()):
+                break  # Too early to show this note (and every note after it)
+            is_hold = note.is_hold()
+            if note.time_ms + 75 < song_time and (not is_hold or song_time > note.get_tail_time()):
                 continue  # Tap note already passed, or hold note completely finished
 
-            # HEAD Y position (where you hit the note)
-            y_head = note.get_screen_y(song_time, hit_y, base_pixels_per_beat)
-            # For hold notes, TAIL Y (where you finish holding)
-            y_tail = note.get_tail_screen_y(song_time, hit_y, base_pixels_per_beat) if note.is_hold() else y_head
-
             # Only render visible range
-            if y_head > screen.get_height() + 100 or y_tail < -100:
+            if y_head > screen_height + 100 or y_tail < -100:
                 continue
 
             # RENDER HOLD BAR (between head and tail, below head and above tail)
-            if note.is_hold():
+            if is_hold:
                 hold_piece = frameset.get("hold_piece")
+                hold_strip = frameset.get("hold_strip")
                 hold_end = frameset.get("hold_end")
-                if hold_piece is not None and hold_end is not None:
+                if hold_piece is not None and hold_strip is not None and hold_end is not None:
                     piece_height = hold_piece.get_height()
 
-                    head_y = note.get_screen_y(song_time, hit_y, base_pixels_per_beat)
-                    tail_y = note.get_tail_screen_y(song_time, hit_y, base_pixels_per_beat)
-
                     if note.hit and note.held and not note.missed:
                         # Being held: bar starts at receptor (hit_y), not at head_y
                         y_top = hit_y
                     else:
                         # Not held (yet), or missed: bar starts at head_y
-                        y_top = head_y
+                        y_top = y_head
 
-                    y_bot = tail_y
+                    y_bot = y_tail
 
                     # Ensure correct direction
                     if y_top > y_bot:
                         y_top, y_bot = y_bot, y_top
 
                     if y_bot - y_top > 0:
-                        y_pos = y_top
-                        while y_pos < y_bot - piece_height:
-                            rect = hold_piece.get_rect(center=(x, int(y_pos + piece_height / 2)))
-                            screen.blit(hold_piece, rect.topleft)
-                            y_pos += piece_height
+                        # Whole pieces from y_top that start above y_bot - piece_height
+                        pieces = max(0, math.ceil((y_bot - piece_height - y_top) / piece_height))
+                        # Skip whole pieces scrolled off the top so the crop stays small
+                        skipped = min(pieces, max(0, int((-piece_height - y_top) // piece_height)))
+                        y_pos = y_top + skipped * piece_height
+                        remaining = (pieces - skipped) * piece_height
+                        strip_height = hold_strip.get_height()
+                        while remaining > 0 and y_pos < screen_height:
+                            length = min(remaining, strip_height)
+                            rect = hold_strip.get_rect(midtop=(x, int(y_pos)))
+                            screen.blit(hold_strip, rect.topleft, area=(0, 0, rect.width, length))
+                            y_pos += length
+                            remaining -= length
                         # Draw end cap/tail at y_bot
-                        rect_end = hold_end.get_rect(center=(x, int(y_bot)))
-                        screen.blit(hold_end, rect_end.topleft)
+                        screen.blit(hold_end, centered(hold_end, (x, y_bot)))
 
             # RENDER HEAD (flash sprite for now, can switch to state-based)
-            sprite = frameset['flash']
-            note.draw(screen, song_time, hit_y, sprite, x, base_pixels_per_beat)
\ No newline at end of file
+            if not note.hit and not note.missed:
+                sprite = frameset['flash']
+                screen.blit(sprite, centered(sprite, (x, y_head)))
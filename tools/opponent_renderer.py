@@ -1,18 +1,20 @@
 import pygame
-from character_animations import CharacterAnimator
+from tools.character_animations import CharacterAnimator
 
 class OpponentRenderer:
     def __init__(self):
         self.opponents = {}
         self.scale = 1.0
 
-    def add_opponent(self, name, sprite_map, position):
+    def add_opponent(self, name, sprite_map, position, sheet_id=None):
         """
-        sprite_map: dict of anim name → list[Surface]
+        sprite_map: dict of anim name → list[SpriteFrame or Surface]
             Required: 'idle', 'singLEFT', 'singDOWN', 'singUP', 'singRIGHT'
         position: (x, y) — base position on 1280x720 grid
+        sheet_id: shared frame cache key (see CharacterAnimator); opponents
+            using the same sheet scale its frames only once
         """
-        anim = CharacterAnimator(sprite_map, position)
+        anim = CharacterAnimator(sprite_map, position, sheet_id)
         anim.rescale((1280, 720))  # default until resized
         self.opponents[name] = anim
 
@@ -0,0 +1,100 @@
+import threading
+
+import pygame
+
+
+class SongAudio:
+    def __init__(self, inst_path, voices_path=None, voices_channel=1):
+        """
+        Song playback with the instrumental streamed instead of fully decoded.
+
+        The instrumental goes through pygame.mixer.music, which SDL_mixer
+        decodes in small chunks on its own audio thread, so it never sits in
+        RAM as PCM. pygame has no incremental decoder for a second stream, so
+        the vocal stem is decoded into a Sound on a background thread that
+        starts right here; play() only waits for whatever part of that decode
+        is still left.
+        """
+        self.inst_path = inst_path
+        self.voices_path = voices_path
+        self.voices_channel_id = voices_channel
+        self.voices_sound = None
+        self.voices_channel = None
+        self._error = None
+        self._thread = None
+        if voices_path:
+            self._thread = threading.Thread(target=self._decode_voices, daemon=True)
+            self._thread.start()
+
+    def _decode_voices(self):
+        try:
+            self.voices_sound = pygame.mixer.Sound(self.voices_path)
+        except pygame.error as e:
+            self._error = e
+
+    def ready(self):
+        """True once play() can start without blocking on the vocal decode."""
+        return self._thread is None or not self._thread.is_alive()
+
+    def play(self):
+        """Start both stems back to back; returns once they are playing."""
+        pygame.mixer.music.load(self.inst_path)
+        if self._thread is not None:
+            self._thread.join()
+        if self._error is not None:
+            print(f"[SongAudio] Could not load {self.voices_path}: {self._error}")
+
+        pygame.mixer.music.play()
+        if self.voices_sound is not None:
+            self.voices_channel = pygame.mixer.Channel(self.voices_channel_id)
+            self.voices_channel.play(self.voices_sound)
+
+    def get_pos(self):
+        """Playback position in ms shared by both stems (-1 when not playing)."""
+        return pygame.mixer.music.get_pos()
+
+    def stop(self):
+        pygame.mixer.music.stop()
+        if self.voices_channel is not None:
+            self.voices_channel.stop()
+
+
+def _pcm_bytes(sound):
+    freq, size, channels = pygame.mixer.get_init()
+    return int(sound.get_length() * freq * channels * abs(size) // 8)
+
+
+if __name__ == "__main__":
+    # Benchmark: full Sound decode of both stems vs. SongAudio, on one song
+    import os
+    import sys
+    import time
+
+    song = sys.argv[1] if len(sys.argv) > 1 else "mutation"
+    inst = f"assets/minigame/songs/{song}/Inst.ogg"
+    voices = f"assets/minigame/songs/{song}/Voices.ogg"
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.mixer.init()
+
+    start = time.perf_counter()
+    inst_sound = pygame.mixer.Sound(inst)
+    voices_sound = pygame.mixer.Sound(voices)
+    pygame.mixer.Channel(0).play(inst_sound)
+    pygame.mixer.Channel(1).play(voices_sound)
+    decoded_ms = (time.perf_counter() - start) * 1000
+    decoded_pcm = _pcm_bytes(inst_sound) + _pcm_bytes(voices_sound)
+    pygame.mixer.stop()
+    del inst_sound, voices_sound
+
+    start = time.perf_counter()
+    audio = SongAudio(inst, voices)
+    audio.play()
+    streamed_ms = (time.perf_counter() - start) * 1000
+    streamed_pcm = _pcm_bytes(audio.voices_sound) if audio.voices_sound else 0
+    audio.stop()
+
+    print(f"{song}: time to first note / resident PCM")
+    print(f"  full decode: {decoded_ms:8.1f} ms  {decoded_pcm / 2**20:7.1f} MiB")
+    print(f"  SongAudio:   {streamed_ms:8.1f} ms  {streamed_pcm / 2**20:7.1f} MiB")
+    pygame.mixer.quit()
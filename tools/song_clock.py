@@ -0,0 +1,69 @@
+import pygame
+
+
+class SongClock:
+    def __init__(self, correction=0.1, max_drift_ms=200, latency_ms=0):
+        """
+        Song time anchored to audio playback.
+
+        Between audio position reports the clock interpolates with
+        pygame.time.get_ticks(); sync() then pulls it toward the reported
+        position a fraction at a time, so mixer buffering and frame hitches
+        are corrected without visible jumps. The value it returns never
+        goes backwards.
+
+        correction: fraction of the measured drift removed per sync()
+        max_drift_ms: drift beyond this is corrected at once (e.g. after a stall)
+        latency_ms: output latency subtracted from the reported audio position
+        """
+        self.correction = correction
+        self.max_drift_ms = max_drift_ms
+        self.latency_ms = latency_ms
+        self.position_source = None
+        self.start_ticks = None
+        self.offset = 0.0
+        self.last_time = 0.0
+
+    def start(self, position_source=None):
+        """
+        Start the clock at song time 0, right after playback starts.
+
+        position_source: callable returning the ms of audio played so far,
+            or a negative value / None while unknown (e.g. pygame.mixer.music.get_pos).
+            Without one (Channel playback has no position query) the clock
+            runs on ticks from the moment playback started.
+        """
+        self.position_source = position_source
+        self.start_ticks = pygame.time.get_ticks()
+        self.offset = 0.0
+        self.last_time = 0.0
+
+    @property
+    def started(self):
+        return self.start_ticks is not None
+
+    def _ticks_time(self):
+        return pygame.time.get_ticks() - self.start_ticks + self.offset
+
+    def sync(self):
+        """Compare against the audio position once per frame and correct drift."""
+        if self.start_ticks is None or self.position_source is None:
+            return
+        audio_time = self.position_source()
+        if audio_time is None or audio_time < 0:
+            return
+        drift = (audio_time - self.latency_ms) - self._ticks_time()
+        if abs(drift) > self.max_drift_ms:
+            self.offset += drift
+        else:
+            self.offset += drift * self.correction
+
+    def get_time(self):
+        """Current song time in ms (0 until start())."""
+        if self.start_ticks is None:
+            return 0.0
+        song_time = self._ticks_time()
+        if song_time < self.last_time:
+            song_time = self.last_time  # Stay monotonic while a correction catches up
+        self.last_time = song_time
+        return song_time
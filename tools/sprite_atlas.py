@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import threading
+
+import pygame
+
+# --- Persistent sprite atlas cache ---
+# Cutting a Sparrow sheet into frames (subsurface + copy, rotate, smoothscale)
+# takes seconds for big character sheets. The finished frames are packed into
+# one atlas image, saved in a .cache folder beside the sheet together with a
+# frame index, and reloaded later as one image decode plus subsurface views.
+# Character frames are stored trimmed to their opaque pixels (SpriteFrame).
+ATLAS_CACHE_DIR = ".cache"
+ATLAS_VERSION = 2
+ATLAS_MAX_WIDTH = 4096
+
+
+class SpriteFrame:
+    """A trimmed sprite: surface (usually a view into an atlas) is drawn at
+    offset inside a logical, untrimmed frame of the given size."""
+    __slots__ = ('surface', 'offset', 'size')
+
+    def __init__(self, surface, offset=(0, 0), size=None):
+        self.surface = surface
+        self.offset = offset
+        self.size = size or surface.get_size()
+
+
+def _digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def atlas_cache_paths(image_path, xml_path, scale, variant=""):
+    """(atlas png, frame index json) for a sheet, keyed by png hash, xml hash and scale."""
+    key = hashlib.sha1(
+        f"{ATLAS_VERSION}|{_digest(image_path)}|{_digest(xml_path)}|{scale!r}|{variant}".encode("utf-8")
+    ).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    cache_dir = os.path.join(os.path.dirname(image_path), ATLAS_CACHE_DIR)
+    base = os.path.join(cache_dir, f"{stem}-{key}")
+    return base + ".png", base + ".json"
+
+
+def _frame_from_index(atlas, entry):
+    view = atlas.subsurface(pygame.Rect(entry[:4]))
+    if len(entry) == 4:
+        return view
+    return SpriteFrame(view, (entry[4], entry[5]), (entry[6], entry[7]))
+
+
+def read_atlas(paths):
+    """Decode a cached atlas without touching the display, so it can run on a worker
+    thread. Returns (frame index, unconverted atlas) for atlas_views, or None on a miss."""
+    atlas_path, index_path = paths
+    if not (os.path.exists(atlas_path) and os.path.exists(index_path)):
+        return None
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        atlas = pygame.image.load(atlas_path)
+    except (OSError, ValueError, pygame.error) as e:
+        print(f"[sprite_atlas] Ignoring broken cache {atlas_path}: {e}")
+        return None
+    return index["frames"], atlas
+
+
+def atlas_views(cached):
+    """Main-thread half of read_atlas: convert the atlas and cut it into views."""
+    entries, atlas = cached
+    atlas = atlas.convert_alpha()
+    return {name: _frame_from_index(atlas, entry) for name, entry in entries.items()}
+
+
+def load_atlas(paths):
+    """Returns {frame name: view into the atlas}, or None on a cache miss.
+    Views are Surfaces, or SpriteFrames if they were saved as SpriteFrames."""
+    cached = read_atlas(paths)
+    return atlas_views(cached) if cached is not None else None
+
+
+def _pack(sizes, max_width=ATLAS_MAX_WIDTH):
+    """Shelf-pack (w, h) sizes; returns (positions, atlas width, atlas height)."""
+    max_width = max([max_width] + [w for w, _ in sizes])
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    positions = [None] * len(sizes)
+    x = y = shelf_h = width = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > max_width:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        positions[i] = (x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+        width = max(width, x)
+    return positions, max(width, 1), max(y + shelf_h, 1)
+
+
+def build_atlas(paths, frames):
+    """Pack frames ({name: Surface or SpriteFrame}) into one atlas and write it to
+    the cache. Frames drawn from the same Surface object are stored once. Needs no
+    display, so it can run on a worker thread; returns (frame index, unconverted
+    atlas) like read_atlas, for atlas_views on the main thread."""
+    unique = []
+    slot_of = {}
+    for frame in frames.values():
+        surf = frame.surface if isinstance(frame, SpriteFrame) else frame
+        if id(surf) not in slot_of:
+            slot_of[id(surf)] = len(unique)
+            unique.append(surf)
+
+    positions, width, height = _pack([s.get_size() for s in unique])
+    atlas = pygame.Surface((width, height), pygame.SRCALPHA)
+    rects = []
+    for surf, pos in zip(unique, positions):
+        atlas.blit(surf, pos)
+        rects.append([pos[0], pos[1], surf.get_width(), surf.get_height()])
+
+    entries = {}
+    for name, frame in frames.items():
+        if isinstance(frame, SpriteFrame):
+            entries[name] = rects[slot_of[id(frame.surface)]] + list(frame.offset) + list(frame.size)
+        else:
+            entries[name] = rects[slot_of[id(frame)]]
+    atlas_path, index_path = paths
+    # Written under temporary names and swapped in, as two workers may build the same sheet
+    tmp = f".{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(atlas_path), exist_ok=True)
+        pygame.image.save(atlas, atlas_path + tmp + ".png")
+        with open(index_path + tmp, 'w') as f:
+            json.dump({"frames": entries}, f)
+        os.replace(atlas_path + tmp + ".png", atlas_path)
+        os.replace(index_path + tmp, index_path)
+    except (OSError, pygame.error) as e:
+        print(f"[sprite_atlas] Could not write cache {atlas_path}: {e}")
+    return entries, atlas
+
+
+def save_atlas(paths, frames):
+    """build_atlas, then return the same frames as views into the converted atlas (main thread)."""
+    return atlas_views(build_atlas(paths, frames))
@@ -1,57 +1,206 @@
+import threading
+from collections import deque
+
 import cv2
+import numpy as np
 import pygame
 
+from tools import video_cache
+
+FIRST_FRAME_TIMEOUT = 5.0  # s the constructor waits for the decoder's first frame
+
 class VideoPlayer:
-    def __init__(self, path, screen_size=(1280, 720), loop=False):
-        self.cap = cv2.VideoCapture(path)
+    def __init__(self, path, screen_size=(1280, 720), loop=False, start_time=0, buffer_frames=8):
+        """
+        Plays a video locked to song time.
+
+        A decoder thread stays up to buffer_frames ahead, resizing and
+        converting each frame into one of buffer_frames preallocated RGB
+        buffers. The main thread only picks the newest frame due at the
+        current song time and copies it into one persistent Surface, so
+        playback allocates nothing per frame.
+
+        If the clip has been pre-transcoded (tools.video_cache), frames are
+        paged in from its memory map instead and no decoding happens at all.
+
+        start_time: song time (ms) at which the video's first frame is shown
+        """
+        self.path = path
         self.screen_size = screen_size
         self.loop = loop
-        self.frame = None
+        self.start_time = start_time
+        self.frame_index = -1
         self.done = False
-        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        self.frame = pygame.Surface(screen_size)
+        self.cap = None
+        self._thread = None
+
+        cached = video_cache.open_cached(path, screen_size)
+        if cached is not None:
+            self.cached_frames, self.fps = cached
+            self.frame_interval = 1000.0 / self.fps  # ms per frame
+            self.update(start_time)
+            return
+        self.cached_frames = None
+
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS)  # -1 for a clip that did not open
+        self.fps = fps if fps > 0 else 30
         self.frame_interval = 1000.0 / self.fps  # ms per frame
-        self.last_frame_time = 0
+        if not self.cap.isOpened():
+            # Missing or unreadable clip: nothing to show, the caller drops the player
+            print(f"[VideoPlayer] Could not open {path}")
+            self.done = True
+            return
 
-        # Ensure first frame is available
-        self.update(0)
+        width, height = screen_size
+        # Source-resolution BGR frame that cap.read() decodes into, reused every frame
+        src_w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        src_h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self._read_buf = np.empty((src_h, src_w, 3), np.uint8) if src_w > 0 and src_h > 0 else None
+        self._buffers = [np.empty((height, width, 3), np.uint8) for _ in range(buffer_frames)]
+        self._free = deque(range(buffer_frames))   # slots the decoder may fill
+        self._ready = deque()                      # (frame_index, slot) in decode order; index None = end
+        self._cond = threading.Condition()
+        self._stop = False
+        self._error = None  # exception that ended the decoder thread, if any
+        self._thread = threading.Thread(target=self._decode_loop, daemon=True)
+        self._thread.start()
 
         # Force load the first frame on init
-        ret, frame = self.cap.read()
-        if ret:
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame = cv2.resize(frame, self.screen_size)
-            self.frame = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-        else:
-            self.frame = None
-            self.done = True
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._ready, timeout=FIRST_FRAME_TIMEOUT):
+                print(f"[VideoPlayer] No frame from {path} after {FIRST_FRAME_TIMEOUT:g} s")
+                self.done = True
+                return
+        self.update(start_time)
+
+    def _decode_loop(self):
+        try:
+            self._decode_frames()
+        except Exception as e:
+            # Never leave __init__ / update() waiting on a dead thread: end the video instead
+            with self._cond:
+                self._error = e
+                self._ready.append((None, None))
+                self._cond.notify_all()
 
-    def update(self, dt):
+    def _decode_frames(self):
+        index = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._free or self._stop)
+                if self._stop:
+                    return
+                slot = self._free.popleft()
+
+            ret, frame = self.cap.read(self._read_buf)
+            if not ret and self.loop:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, frame = self.cap.read(self._read_buf)
+            if not ret:
+                with self._cond:
+                    self._ready.append((None, slot))
+                    self._cond.notify_all()
+                return
+
+            buf = self._buffers[slot]
+            cv2.resize(frame, self.screen_size, dst=buf)
+            cv2.cvtColor(buf, cv2.COLOR_BGR2RGB, dst=buf)
+            with self._cond:
+                self._ready.append((index, slot))
+                self._cond.notify_all()
+            index += 1
+
+    def update(self, song_time):
+        """Show the newest decoded frame that is due at song_time."""
         if self.done:
             return None
-        self.last_frame_time += dt
-        # Only decode a new frame if enough time has passed
-        if self.last_frame_time < self.frame_interval:
-            return self.frame
-        self.last_frame_time -= self.frame_interval
-        ret, frame = self.cap.read()
-        if not ret:
-            if self.loop:
-                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                ret, frame = self.cap.read()
-                if not ret:
-                    self.done = True
-                    return None
-            else:
+        target = int((song_time - self.start_time) // self.frame_interval)
+        if self.cached_frames is not None:
+            return self._update_cached(target)
+
+        newest = None
+        with self._cond:
+            while self._ready:
+                index, slot = self._ready[0]
+                if index is None:
+                    if self._error is not None:
+                        print(f"[VideoPlayer] Decoding {self.path} failed: {self._error!r}")
+                        self.done = True
+                    # End of video: finished once the last frame has had its turn
+                    elif newest is None and target > self.frame_index:
+                        self._ready.popleft()
+                        self._free.append(slot)
+                        self.done = True
+                    break
+                if index > target:
+                    break
+                self._ready.popleft()
+                if newest is not None:
+                    self._free.append(newest)  # Skipped: the music is already past it
+                newest = slot
+                self.frame_index = index
+            self._cond.notify_all()
+
+        if self.done:
+            return None
+        if newest is not None:
+            # swapaxes is a view: (h, w, 3) -> surfarray's (w, h, 3), no copy
+            pygame.surfarray.blit_array(self.frame, self._buffers[newest].swapaxes(0, 1))
+            with self._cond:
+                self._free.append(newest)
+                self._cond.notify_all()
+        return self.frame
+
+    def _update_cached(self, target):
+        count = len(self.cached_frames)
+        if target >= count:
+            if not self.loop:
                 self.done = True
                 return None
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame = cv2.resize(frame, self.screen_size)
-        self.frame = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
+            target %= count
+        if target != self.frame_index:
+            pygame.surfarray.blit_array(self.frame, self.cached_frames[max(target, 0)].swapaxes(0, 1))
+            self.frame_index = target
         return self.frame
 
     def draw(self, screen):
-        if self.frame is not None:
+        if self.frame_index >= 0:
             screen.blit(self.frame, (0, 0))
 
     def release(self):
-        self.cap.release()
+        if self._thread is not None:
+            with self._cond:
+                self._stop = True
+                self._cond.notify_all()
+            self._thread.join()
+        if self.cap is not None:
+            self.cap.release()
+
+
+if __name__ == "__main__":
+    # Regression check: a clip that can't be opened must not raise, just end at once
+    player = VideoPlayer("assets/video/does-not-exist.mp4")
+    assert player.done and player.update(0) is None and player.frame_index == -1
+    player.release()
+    print("VideoPlayer: missing clip handled")
+
+    # A decoder thread that raises must end the video, not hang the constructor
+    import os
+    import tempfile
+    clip = os.path.join(tempfile.mkdtemp(), "clip.avi")
+    writer = cv2.VideoWriter(clip, cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+    for _ in range(10):
+        writer.write(np.zeros((48, 64, 3), np.uint8))
+    writer.release()
+    resize = cv2.resize
+    def broken_resize(*args, **kwargs):
+        raise cv2.error("corrupt frame")
+    cv2.resize = broken_resize
+    player = VideoPlayer(clip)
+    cv2.resize = resize
+    assert player.done and isinstance(player._error, cv2.error)
+    player.release()
+    os.remove(clip)
+    print("VideoPlayer: decoder failure handled")
@@ -0,0 +1,166 @@
+import os
+import struct
+import threading
+
+import cv2
+import numpy as np
+
+# --- Pre-transcoded video cache ---
+# Each clip used by a chart "vid" event is decoded once to raw RGB frames at
+# screen resolution (intro.mp4 -> intro.1280x720.rawvid) so VideoPlayer can
+# page frames in from a memory map with no codec work during gameplay.
+# Raw frames are large (~2.6 MiB each at 1280x720), which is the trade-off, so
+# clips whose cache would exceed MAX_TRANSCODE_BYTES are left to live decoding.
+MAX_TRANSCODE_BYTES = 2 * 2**30
+VIDEO_CACHE_EXT = ".rawvid"
+VIDEO_CACHE_MAGIC = b"SIGVID01"
+# magic, source mtime_ns, width, height, fps, frame count
+_HEADER = struct.Struct("<8sqIIdI")
+
+_mapped = {}  # cache path -> (frames memmap, fps)
+_lock = threading.Lock()
+
+
+def video_cache_path(path, size):
+    return f"{os.path.splitext(path)[0]}.{size[0]}x{size[1]}{VIDEO_CACHE_EXT}"
+
+
+def _read_header(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            return _HEADER.unpack(f.read(_HEADER.size))
+    except (OSError, struct.error):
+        return None
+
+
+def is_transcoded(path, size):
+    header = _read_header(video_cache_path(path, size))
+    if header is None or header[0] != VIDEO_CACHE_MAGIC:
+        return False
+    # A cache whose source is gone is still usable
+    return not os.path.exists(path) or header[1] == os.stat(path).st_mtime_ns
+
+
+def transcode(path, size, max_bytes=MAX_TRANSCODE_BYTES):
+    """
+    Decode every frame of path to RGB at size and write the raw cache file.
+    Returns False (and writes nothing) if the clip can't be opened or its raw
+    frames would take more than max_bytes.
+    """
+    cache_path = video_cache_path(path, size)
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        print(f"[video_cache] Could not open {path}")
+        return False
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if fps <= 0:
+        fps = 30
+    frame = np.empty((size[1], size[0], 3), np.uint8)
+    estimate = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) * frame.nbytes
+    if estimate > max_bytes:
+        print(f"[video_cache] Skipping {path}: ~{estimate / 2**20:.0f} MiB raw is over the "
+              f"{max_bytes / 2**20:.0f} MiB cap, it will be decoded live")
+        cap.release()
+        return False
+    count = 0
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(VIDEO_CACHE_MAGIC, 0, size[0], size[1], fps, 0))
+        while True:
+            ret, src = cap.read()
+            if not ret:
+                break
+            if (count + 1) * frame.nbytes > max_bytes:
+                break  # Frame count was missing or wrong
+            cv2.resize(src, size, dst=frame)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+            f.write(frame.tobytes())
+            count += 1
+        if ret:
+            print(f"[video_cache] Skipping {path}: raw frames passed the {max_bytes / 2**20:.0f} MiB cap")
+        else:
+            # Header last, so a half-written file never looks complete
+            f.seek(0)
+            f.write(_HEADER.pack(VIDEO_CACHE_MAGIC, os.stat(path).st_mtime_ns, size[0], size[1], fps, count))
+    cap.release()
+    if ret:
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, cache_path)
+    return True
+
+
+def transcode_missing(paths, size, max_bytes=MAX_TRANSCODE_BYTES):
+    """
+    Transcode every clip in paths that has no current cache (first run). Slow:
+    run it offline or behind a loading screen, never while a song is playing.
+    """
+    for path in paths:
+        if os.path.exists(path) and not is_transcoded(path, size):
+            transcode(path, size, max_bytes)
+
+
+def open_cached(path, size):
+    """Returns (frames, fps) with frames a read-only (count, h, w, 3) memmap, or None."""
+    cache_path = video_cache_path(path, size)
+    with _lock:
+        if cache_path in _mapped:
+            return _mapped[cache_path]
+    if not is_transcoded(path, size):
+        return None
+    _, _, width, height, fps, count = _read_header(cache_path)
+    if count == 0:
+        return None
+    frames = np.memmap(cache_path, np.uint8, 'r', offset=_HEADER.size, shape=(count, height, width, 3))
+    with _lock:
+        _mapped[cache_path] = (frames, fps)
+    return frames, fps
+
+
+def preload(path, size, warm_ms=1000):
+    """Map a clip ahead of its event and page in its first warm_ms of frames on a worker thread."""
+    def warm():
+        cached = open_cached(path, size)
+        if cached is None:
+            return
+        frames, fps = cached
+        for i in range(min(len(frames), int(fps * warm_ms / 1000) + 1)):
+            frames[i, :, 0, 0].sum()  # one byte per row touches every page of the frame
+    threading.Thread(target=warm, daemon=True).start()
+
+
+def release(path, size):
+    with _lock:
+        _mapped.pop(video_cache_path(path, size), None)
+
+
+def chart_video_paths(events):
+    """Video paths referenced by "vid" events, in order of appearance."""
+    paths = []
+    for _, event_list in events or []:
+        for event in event_list:
+            if event[0] == "vid":
+                path = event[1] or "assets/video/default.mp4"
+                if path not in paths:
+                    paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    # Offline step: transcode every video the FNF charts reference
+    import json
+    import sys
+
+    songs_dir = sys.argv[1] if len(sys.argv) > 1 else "assets/minigame/songs"
+    size = (1280, 720)
+    for song_name in sorted(os.listdir(songs_dir)):
+        chart_path = os.path.join(songs_dir, song_name, f"{song_name}.json")
+        if not os.path.exists(chart_path):
+            continue
+        with open(chart_path, 'r') as f:
+            events = json.load(f).get("song", {}).get("events")
+        for path in chart_video_paths(events):
+            if is_transcoded(path, size):
+                print(f"Up to date: {video_cache_path(path, size)}")
+            elif transcode(path, size):
+                print(f"Transcoded {path} -> {video_cache_path(path, size)}")
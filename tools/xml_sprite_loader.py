@@ -1,6 +1,7 @@
 import pygame
 import xml.etree.ElementTree as ET
 from tools.arrow_handler import DEFAULT_SPRITE_KEYS
+from tools.sprite_atlas import SpriteFrame, atlas_cache_paths, atlas_views, build_atlas, read_atlas
 
 FNF_DIRECTION_COLOR = {
     'left':   'purple',
@@ -9,12 +10,33 @@ FNF_DIRECTION_COLOR = {
     'right':  'red'
 }
 
-def load_sprites_from_xml(image_path, xml_path, scale=1.0):
-    image = pygame.image.load(image_path).convert_alpha()
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
+HOLD_STRIP_HEIGHT = 1024  # px; taller than any on-screen hold bar at 1280x720
+
+def build_hold_strip(hold_piece, min_height=HOLD_STRIP_HEIGHT):
+    """Tile hold_piece vertically into one tall surface so a whole hold bar
+    can be drawn as a single cropped blit."""
+    w, piece_height = hold_piece.get_size()
+    count = max(1, -(-min_height // piece_height))
+    strip = pygame.Surface((w, count * piece_height), pygame.SRCALPHA)
+    for i in range(count):
+        strip.blit(hold_piece, (0, i * piece_height))
+    return strip
+
+def _cut_frames(image, root, scale, character):
+    """Cut every SubTexture out of a Sparrow sheet (decoded image, parsed xml root),
+    scaled. SubTextures that share a source rect share one Surface.
+
+    character: also handle rotated SubTextures, and return SpriteFrames trimmed to
+        their opaque pixels, placed by the sheet's frameX/frameY/frameWidth/frameHeight.
 
-    raw_frames = {}
+    Works on the unconverted image, so it can run on a worker thread.
+    """
+    if image.get_bitsize() != 32 or not image.get_flags() & pygame.SRCALPHA:
+        # e.g. paletted or RGB PNGs: smoothscale and trimming want 32-bit RGBA
+        image = image.convert(pygame.Surface((1, 1), pygame.SRCALPHA, 32))
+
+    frames = {}
+    by_rect = {}
     for sub in root.findall('SubTexture'):
         name = sub.attrib['name']
         x = int(sub.attrib['x'])
@@ -22,13 +44,75 @@ def load_sprites_from_xml(image_path, xml_path, scale=1.0):
         w = int(sub.attrib['width'])
         h = int(sub.attrib['height'])
 
-        frame = image.subsurface(pygame.Rect(x, y, w, h)).copy()
-        if scale != 1.0:
-            frame = pygame.transform.smoothscale(
-                frame,
-                (int(w * scale), int(h * scale))
-            )
-        raw_frames[name] = frame
+        # Check for 'rotated="true"'
+        rotated = character and sub.attrib.get('rotated', 'false') == 'true'
+        key = (x, y, w, h, rotated)
+        if key not in by_rect:
+            frame = image.subsurface(pygame.Rect(x, y, w, h))
+            if rotated:
+                frame = pygame.transform.rotate(frame, 90)  # 90 degrees CCW
+            trim = frame.get_bounding_rect() if character else frame.get_rect()
+            if trim.width == 0 or trim.height == 0:
+                trim = pygame.Rect(0, 0, 1, 1)  # Fully transparent frame
+            frame = frame.subsurface(trim).copy()
+            if scale != 1.0:
+                frame = pygame.transform.smoothscale(
+                    frame,
+                    (max(1, int(frame.get_width() * scale)), max(1, int(frame.get_height() * scale)))
+                )
+            by_rect[key] = (frame, trim.topleft)
+        frame, (trim_x, trim_y) = by_rect[key]
+
+        if not character:
+            frames[name] = frame
+            continue
+        # Sparrow frames sit at (-frameX, -frameY) inside a frameWidth x frameHeight frame
+        frame_x = -int(sub.attrib.get('frameX', 0))
+        frame_y = -int(sub.attrib.get('frameY', 0))
+        src_w, src_h = (h, w) if rotated else (w, h)
+        frame_w = int(sub.attrib.get('frameWidth', src_w))
+        frame_h = int(sub.attrib.get('frameHeight', src_h))
+        frames[name] = SpriteFrame(
+            frame,
+            (int((frame_x + trim_x) * scale), int((frame_y + trim_y) * scale)),
+            (int(frame_w * scale), int(frame_h * scale))
+        )
+
+    return frames
+
+# Loaded sheets by (image_path, xml_path, scale, character); every animator using
+# the same sheet at the same scale shares one atlas
+_sheet_cache = {}
+
+def read_sheet(image_path, xml_path, scale=1.0, character=False):
+    """
+    The part of loading a sheet that needs no display: hashing and decoding the
+    cached atlas or, on a miss, PNG decode, XML parsing, cutting the frames and
+    writing the atlas. Safe to run on a worker thread (see tools.asset_loader);
+    pass the result to finish_sprites / finish_character_sprites on the main thread.
+    """
+    memo_key = (image_path, xml_path, scale, character)
+    if memo_key in _sheet_cache:
+        return memo_key, None
+    paths = atlas_cache_paths(image_path, xml_path, scale, variant="character" if character else "")
+    cached = read_atlas(paths)
+    if cached is None:
+        image, root = pygame.image.load(image_path), ET.parse(xml_path).getroot()
+        cached = build_atlas(paths, _cut_frames(image, root, scale, character))
+    return memo_key, cached
+
+def _finish_sheet(sheet):
+    """Frames as views into the sheet's atlas; only convert_alpha() and subsurfaces happen here."""
+    memo_key, cached = sheet
+    if memo_key in _sheet_cache:
+        return _sheet_cache[memo_key]
+    frames = atlas_views(cached)
+    _sheet_cache[memo_key] = frames
+    return frames
+
+def finish_sprites(sheet):
+    """Note-skin frames from a read_sheet result (main thread)."""
+    raw_frames = _finish_sheet(sheet)
 
     # Convert to arrow_frames structure
     arrow_frames = {}
@@ -41,44 +125,24 @@ def load_sprites_from_xml(image_path, xml_path, scale=1.0):
             'hold_piece': raw_frames.get(f"{color} hold piece instance 10000"),
             'hold_end': raw_frames.get(f"{color} hold end instance 10000"),
         }
+        hold_piece = arrow_frames[dir]['hold_piece']
+        arrow_frames[dir]['hold_strip'] = build_hold_strip(hold_piece) if hold_piece is not None else None
 
     # Optionally include raw XML access
     arrow_frames['_raw'] = raw_frames
 
     return arrow_frames
 
-def load_character_sprites_from_xml(image_path, xml_path, scale=1.0):
-    import pygame
-    import xml.etree.ElementTree as ET
-
-    image = pygame.image.load(image_path).convert_alpha()
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-
-    frames = {}
-    for sub in root.findall('SubTexture'):
-        name = sub.attrib['name']
-        x = int(sub.attrib['x'])
-        y = int(sub.attrib['y'])
-        w = int(sub.attrib['width'])
-        h = int(sub.attrib['height'])
+def finish_character_sprites(sheet):
+    """Character frames from a read_sheet(..., character=True) result (main thread)."""
+    return _finish_sheet(sheet)
 
-        # Check for 'rotated="true"'
-        rotated = sub.attrib.get('rotated', 'false') == 'true'
-        if rotated:
-            frame = image.subsurface(pygame.Rect(x, y, w, h)).copy()
-            frame = pygame.transform.rotate(frame, 90)  # 90 degrees CCW
-        else:
-            frame = image.subsurface(pygame.Rect(x, y, w, h)).copy()
-
-        if scale != 1.0:
-            frame = pygame.transform.smoothscale(
-                frame,
-                (int(frame.get_width() * scale), int(frame.get_height() * scale))
-            )
-        frames[name] = frame
+def load_sprites_from_xml(image_path, xml_path, scale=1.0):
+    return finish_sprites(read_sheet(image_path, xml_path, scale))
 
-    return frames
+def load_character_sprites_from_xml(image_path, xml_path, scale=1.0):
+    """Returns {frame name: SpriteFrame}, trimmed views into one shared atlas."""
+    return finish_character_sprites(read_sheet(image_path, xml_path, scale, character=True))
 
 def load_character_frames(name_prefix, frames_dict, anims=('idle', 'singLEFT', 'singDOWN', 'singUP', 'singRIGHT')):
     """